@@ -0,0 +1,50 @@
+"""
+Dash 콜백 요청(/_dash-update-component) 본문을 만드는 도우미입니다.
+벤치마크, 부하 테스트, 정적 내보내기(export_static.py)가 브라우저와 같은 요청을 재현할 때 사용합니다.
+"""
+
+
+def split_output(output):
+    """
+    콜백 output 문자열을 (id, property) 목록으로 나눕니다.
+    다중 출력은 '..a.children...b.className..' 형식입니다.
+    """
+    if output.startswith('..') and output.endswith('..'):
+        parts = output[2:-2].split('...')
+    else:
+        parts = [output]
+    return [tuple(part.rsplit('.', 1)) for part in parts]
+
+
+def find_dependency(dependencies, output_id):
+    """
+    /_dash-dependencies 목록에서 output_id 를 출력으로 갖는 서버 콜백을 찾습니다.
+    """
+    for dependency in dependencies:
+        if dependency.get('clientside_function'):
+            continue
+        if any(component_id == output_id for component_id, _ in split_output(dependency['output'])):
+            return dependency
+    return None
+
+
+def build_body(dependency, values, triggered=()):
+    """
+    콜백 요청 본문을 만듭니다. values 는 {'컴포넌트id.속성': 값}, triggered 는 변경된 'id.속성' 목록입니다.
+    """
+    outputs = [{'id': component_id, 'property': prop} for component_id, prop in split_output(dependency['output'])]
+    inputs = [
+        {'id': item['id'], 'property': item['property'], 'value': values.get(f"{item['id']}.{item['property']}")}
+        for item in dependency['inputs']
+    ]
+    state = [
+        {'id': item['id'], 'property': item['property'], 'value': values.get(f"{item['id']}.{item['property']}")}
+        for item in dependency['state']
+    ]
+    return {
+        'output': dependency['output'],
+        'outputs': outputs if len(outputs) > 1 else outputs[0],
+        'inputs': inputs,
+        'state': state,
+        'changedPropIds': list(triggered),
+    }
@@ -0,0 +1,95 @@
+"""
+임포트 시간 보고서
+
+새 프로세스에서 python -X importtime 으로 run(또는 boot) 모듈을 임포트하고, 임포트 시간을 최상위 패키지별로
+합산하여 출력합니다. 부팅을 느리게 하는 의존성(dash, pandas, plotly 등)을 찾고 변화를 추적하는 데 사용합니다.
+시간은 모듈 자체 임포트 시간(self)의 합이므로 패키지별 값을 더하면 전체 임포트 시간이 됩니다.
+
+사용 예:
+    python benchmarks/import_report.py
+    python benchmarks/import_report.py --module boot
+    python benchmarks/import_report.py --repeat 5 --json benchmarks/results-import.json --max-ms 3000
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# import time:       123 |       4567 |     package.module
+LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def _package(name):
+    # 이 저장소의 모듈은 src.data_handler 처럼 모듈 단위로, 그 밖의 의존성은 최상위 패키지 단위로 묶습니다.
+    parts = name.split('.')
+    return '.'.join(parts[:2]) if parts[0] == 'src' else parts[0]
+
+
+def measure(module):
+    """
+    새 프로세스에서 module 을 임포트하고 {패키지: self 시간(ms)} 과 전체 시간(ms)을 반환합니다.
+    """
+    env = dict(os.environ, CUK_RELOAD_INTERVAL='0', CUK_SHARED_DATA='0')
+    output = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    packages, total = {}, 0.0
+    for line in output.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        self_ms = int(match.group(1)) / 1000
+        packages[_package(match.group(4))] = packages.get(_package(match.group(4)), 0.0) + self_ms
+        if match.group(4) == module:
+            total = int(match.group(2)) / 1000
+    return packages, total
+
+
+def report(module, repeat):
+    """
+    repeat 번 측정한 패키지별 임포트 시간의 중앙값을 큰 순서로 반환합니다.
+    """
+    runs = [measure(module) for _ in range(repeat)]
+    names = {name for packages, _ in runs for name in packages}
+    rows = [
+        {'package': name, 'median_ms': statistics.median(packages.get(name, 0.0) for packages, _ in runs)}
+        for name in names
+    ]
+    rows.sort(key=lambda row: row['median_ms'], reverse=True)
+    return {'module': module, 'runs': repeat, 'total_ms': statistics.median(total for _, total in runs), 'packages': rows}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--module', default='run', help='임포트할 모듈 (run: 기존 진입점, boot: 빠른 부팅 진입점)')
+    parser.add_argument('--repeat', type=int, default=3, help='측정 횟수 (중앙값 사용)')
+    parser.add_argument('--top', type=int, default=15, help='출력할 패키지 수')
+    parser.add_argument('--json', help='결과를 저장할 JSON 파일')
+    parser.add_argument('--max-ms', type=float, help='전체 임포트 시간이 이 값을 넘으면 종료 코드 1')
+    args = parser.parse_args(argv)
+
+    result = report(args.module, args.repeat)
+    total = result['total_ms'] or 1.0
+    print(f"import {args.module}: {result['total_ms']:.1f}ms (median of {args.repeat})")
+    for row in result['packages'][:args.top]:
+        print(f"  {row['package']:<40} {row['median_ms']:9.1f}ms {row['median_ms'] / total * 100:6.1f}%")
+
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"Results written to {args.json}")
+    if args.max_ms is not None and result['total_ms'] > args.max_ms:
+        print(f"import {args.module}: {result['total_ms']:.1f}ms > budget {args.max_ms}ms")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
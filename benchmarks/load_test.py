@@ -0,0 +1,343 @@
+"""
+부하 테스트
+
+로컬에서 gunicorn 으로 앱(run:server 또는 boot:server)을 워커/스레드 수를 바꿔 가며 띄우고, 여러 가상 사용자가
+브라우저와 같은 요청 흐름을 동시에 반복했을 때의 처리량(요청/초)과 지연시간(p50/p95/p99)을 측정합니다.
+app.yaml 의 인스턴스 크기와 워커 수를 정할 때 설정별 결과를 비교하는 데 사용합니다.
+
+가상 사용자 한 명의 세션은 다음과 같습니다. 각 사용자는 연결(keep-alive) 하나를 계속 사용합니다.
+    1. 페이지 로드: GET /, /_dash-layout, /_dash-dependencies 와 첫 화면 콜백(display_page, 요약 화면)
+    2. 동작 --actions 회: 년도 변경(year), 메뉴 이동 후 요약으로 복귀(menu), 추이 보기(trend) 중 가중치에 따라 선택
+       추이 보기 토글이 브라우저에서 처리되는 경우(CUK_CLIENTSIDE_TOGGLE=1)에는 추이 그래프 확대 요청을 보냅니다.
+    동작 사이에는 --think 초(지수 분포) 동안 쉽니다. 0 이면 쉬지 않고 최대 부하를 겁니다.
+
+부하를 거는 쪽도 같은 머신의 CPU 를 사용하므로, 워커 수가 코어 수에 가까우면 결과가 낮게 나올 수 있습니다.
+
+사용 예:
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --configs 1x1,2x4,4x4 --users 16 --duration 30
+    python benchmarks/load_test.py --app boot:server --think 1 --json benchmarks/results-load.json
+"""
+import argparse
+import gzip
+import http.client
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.dash_requests import build_body, find_dependency, split_output
+
+UPDATE_PATH = '/_dash-update-component'
+# 동작별 선택 가중치
+ACTION_WEIGHTS = {'year': 5, 'menu': 2, 'trend': 3}
+
+
+def percentile(values, q):
+    """
+    정렬된 values 의 q 백분위수 (nearest-rank)
+    """
+    if not values:
+        return None
+    return values[max(0, math.ceil(q / 100 * len(values)) - 1)]
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _find(node, component_id):
+    # 콜백 응답의 컴포넌트 트리에서 id 가 같은 컴포넌트의 props 를 찾습니다.
+    if isinstance(node, list):
+        for child in node:
+            found = _find(child, component_id)
+            if found is not None:
+                return found
+    elif isinstance(node, dict):
+        props = node.get('props')
+        if isinstance(props, dict):
+            if props.get('id') == component_id:
+                return props
+            return _find(props.get('children'), component_id)
+    return None
+
+
+class Server:
+    """
+    gunicorn 으로 앱을 띄우고 첫 응답이 올 때까지 기다립니다. with 블록이 끝나면 종료합니다.
+    """
+
+    def __init__(self, app, workers, threads, timeout):
+        self.port = _free_port()
+        self.log = tempfile.NamedTemporaryFile(prefix='cuk_dash_load-', suffix='.log', delete=False)
+        env = dict(os.environ)
+        # 측정 중에는 데이터 변경 감지를 끕니다.
+        env.setdefault('CUK_RELOAD_INTERVAL', '0')
+        # 빠른 부팅 진입점은 app.yaml 과 같이 preload 없이 실행합니다 (gunicorn.conf.py 참고).
+        if app.startswith('boot:'):
+            env.setdefault('CUK_FAST_BOOT', '1')
+        command = [
+            sys.executable, '-m', 'gunicorn', '-c', os.path.join(ROOT, 'gunicorn.conf.py'),
+            '-b', f'127.0.0.1:{self.port}', '-w', str(workers), '--threads', str(threads), app,
+        ]
+        self.process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=self.log, stderr=subprocess.STDOUT)
+        self._wait(timeout)
+
+    def _wait(self, timeout):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                break
+            try:
+                connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=timeout)
+                connection.request('GET', '/')
+                if connection.getresponse().status == 200:
+                    return
+            except OSError:
+                time.sleep(0.2)
+        self.close()
+        with open(self.log.name, encoding='utf-8', errors='replace') as f:
+            tail = f.read()[-2000:]
+        raise RuntimeError(f"gunicorn did not become ready within {timeout}s:\n{tail}")
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        os.unlink(self.log.name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class User:
+    """
+    가상 사용자 한 명. 연결 하나로 세션을 반복하며 요청마다 (종류, 시작 시각, 지연시간(ms), 성공 여부)를 기록합니다.
+    """
+
+    def __init__(self, port, dependencies, args, seed, records):
+        self.port = port
+        self.args = args
+        self.random = random.Random(seed)
+        self.records = records
+        self.connection = None
+        self.pages = find_dependency(dependencies, 'page-content')
+        self.summary = find_dependency(dependencies, 'summary-content')
+        self.menus = [component_id for component_id, _ in split_output(self.pages['output'])[1:]]
+        self.server_toggle = any(item['id'] == 'trend-button' for item in self.summary['inputs'])
+        self.zoom = [dependency for dependency in dependencies
+                     if not dependency.get('clientside_function') and dependency['output'].endswith('.figure')]
+
+    def _request(self, kind, method, path, body=None):
+        if self.connection is None:
+            self.connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=self.args.timeout)
+        # 응답 본문(년도 목록, 요약 화면 상태)을 읽어야 하므로 표준 라이브러리로 풀 수 있는 gzip 압축을 받습니다.
+        headers = {'Accept-Encoding': 'gzip'}
+        if body is not None:
+            body = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+        start = time.perf_counter()
+        started = time.monotonic()
+        try:
+            self.connection.request(method, path, body=body, headers=headers)
+            response = self.connection.getresponse()
+            data = response.read()
+            ok = response.status < 400
+            if ok and response.getheader('Content-Encoding') == 'gzip':
+                data = gzip.decompress(data)
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            self.connection = None
+            data, ok = b'', False
+        self.records.append((kind, started, (time.perf_counter() - start) * 1000, ok))
+        return data if ok else None
+
+    def _callback(self, kind, dependency, values, triggered=()):
+        data = self._request(kind, 'POST', UPDATE_PATH, build_body(dependency, values, triggered))
+        # 204(PreventUpdate)는 빈 본문입니다.
+        return json.loads(data)['response'] if data else None
+
+    def _show_page(self, menu=None):
+        values = {f'{component_id}.n_clicks': self.clicks.get(component_id) for component_id in self.menus}
+        triggered = [f'{menu}.n_clicks'] if menu else []
+        response = self._callback('display_page', self.pages, values, triggered)
+        return response and response['page-content']['children']
+
+    def _open_summary(self, menu=None):
+        page = self._show_page(menu)
+        years = _find(page, 'year-selector')
+        shown = _find(page, 'summary-shown')
+        self.years = [option['value'] for option in years['options']] if years else []
+        self.year = years['value'] if years else None
+        self.shown = shown.get('data') if shown else None
+
+    def _values(self):
+        return {
+            'year-selector.value': self.year, 'base-year-selector.value': 'prev',
+            'summary-shown.data': self.shown, 'trend-button.n_clicks': self.trend_clicks,
+        }
+
+    def _update_summary(self, kind, triggered):
+        response = self._callback(kind, self.summary, self._values(), triggered)
+        if response and 'summary-shown' in response:
+            self.shown = response['summary-shown']['data']
+
+    def session(self):
+        self.clicks = {}
+        self.trend_clicks = 0
+        for path in ('/', '/_dash-layout', '/_dash-dependencies'):
+            self._request('page_load', 'GET', path)
+        self._open_summary()
+        self._update_summary('year_switch', [])
+
+        actions = list(ACTION_WEIGHTS)
+        weights = [ACTION_WEIGHTS[action] for action in actions]
+        for _ in range(self.args.actions):
+            if self.stop.is_set():
+                return
+            if self.args.think > 0:
+                time.sleep(self.random.expovariate(1 / self.args.think))
+            action = self.random.choices(actions, weights)[0]
+            if action == 'year' and self.years:
+                self.year = self.random.choice(self.years)
+                self._update_summary('year_switch', ['year-selector.value'])
+            elif action == 'menu':
+                menu = self.random.choice(self.menus[1:] or self.menus)
+                self.clicks[menu] = (self.clicks.get(menu) or 0) + 1
+                self._show_page(menu)
+                home = self.menus[0]
+                self.clicks[home] = (self.clicks.get(home) or 0) + 1
+                self._open_summary(home)
+            elif action == 'trend' and self.server_toggle:
+                self.trend_clicks += 1
+                self._update_summary('trend_toggle', ['trend-button.n_clicks'])
+            elif action == 'trend' and self.zoom and self.years:
+                dependency = self.random.choice(self.zoom)
+                graph_id = dependency['inputs'][0]['id']
+                low, high = sorted(self.random.sample(self.years, 2)) if len(self.years) > 1 else (self.years[0], self.years[0])
+                relayout = {'xaxis.range[0]': low, 'xaxis.range[1]': high}
+                self._callback('trend_zoom', dependency, {f'{graph_id}.relayoutData': relayout}, [f'{graph_id}.relayoutData'])
+
+    def run(self, stop):
+        self.stop = stop
+        while not stop.is_set():
+            self.session()
+
+
+def summarize(records, window):
+    """
+    측정 구간의 기록으로 요청 종류별, 전체 처리량(요청/초)과 지연시간 백분위수(ms)를 계산합니다.
+    """
+    groups = {'all': records}
+    for record in records:
+        groups.setdefault(record[0], []).append(record)
+    summary = {}
+    for kind, items in groups.items():
+        latencies = sorted(latency for _, _, latency, ok in items if ok)
+        summary[kind] = {
+            'requests': len(items),
+            'errors': sum(1 for item in items if not item[3]),
+            'throughput_rps': len(items) / window,
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95),
+            'p99_ms': percentile(latencies, 99),
+        }
+    return summary
+
+
+def run_config(app, workers, threads, args):
+    """
+    워커 workers 개, 워커당 스레드 threads 개로 앱을 띄우고 --users 명이 --duration 초 동안 요청한 결과를 반환합니다.
+    처음 --warmup 초의 요청(그래프 캐시 등 준비 구간)은 결과에서 뺍니다.
+    """
+    with Server(app, workers, threads, args.boot_timeout) as server:
+        connection = http.client.HTTPConnection('127.0.0.1', server.port, timeout=args.timeout)
+        connection.request('GET', '/_dash-dependencies')
+        dependencies = json.loads(connection.getresponse().read())
+        connection.close()
+
+        records = []
+        stop = threading.Event()
+        users = [User(server.port, dependencies, args, seed, records) for seed in range(args.users)]
+        threads_ = [threading.Thread(target=user.run, args=(stop,), daemon=True) for user in users]
+        start = time.monotonic()
+        for thread in threads_:
+            thread.start()
+        time.sleep(args.warmup + args.duration)
+        stop.set()
+        for thread in threads_:
+            thread.join(args.timeout)
+
+    measured_from = start + args.warmup
+    measured = [record for record in records if measured_from <= record[1] < measured_from + args.duration]
+    return {
+        'app': app, 'workers': workers, 'threads': threads, 'users': args.users, 'think_s': args.think,
+        'duration_s': args.duration, 'results': summarize(measured, args.duration),
+    }
+
+
+def _configs(text):
+    # '2x4' -> (워커 2, 스레드 4)
+    configs = []
+    for item in text.split(','):
+        workers, _, threads = item.strip().partition('x')
+        configs.append((int(workers), int(threads or 1)))
+    return configs
+
+
+def _ms(value):
+    return '-' if value is None else f'{value:.1f}'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--app', default='run:server', help='gunicorn 앱 (run:server 또는 boot:server)')
+    parser.add_argument('--configs', default='1x1,2x1,2x4,4x4', help='쉼표로 구분한 "워커x스레드" 설정 목록')
+    parser.add_argument('--users', type=int, default=8, help='동시 가상 사용자 수')
+    parser.add_argument('--duration', type=float, default=20, help='설정별 측정 시간(초)')
+    parser.add_argument('--warmup', type=float, default=3, help='측정에서 빼는 시작 구간(초)')
+    parser.add_argument('--actions', type=int, default=10, help='세션당 동작 수 (페이지 로드 후)')
+    parser.add_argument('--think', type=float, default=0, help='동작 사이 평균 대기 시간(초)')
+    parser.add_argument('--timeout', type=float, default=30, help='요청 타임아웃(초)')
+    parser.add_argument('--boot-timeout', type=float, default=120, help='서버가 첫 응답을 할 때까지 기다리는 시간(초)')
+    parser.add_argument('--json', help='결과를 저장할 JSON 파일')
+    args = parser.parse_args(argv)
+
+    reports = []
+    for workers, threads in _configs(args.configs):
+        print(f"{args.app} workers={workers} threads={threads} users={args.users} ...", flush=True)
+        report = run_config(args.app, workers, threads, args)
+        reports.append(report)
+        for kind, stats in report['results'].items():
+            print(f"  {kind:<14} {stats['requests']:7d} req {stats['throughput_rps']:8.1f} req/s "
+                  f"p50 {_ms(stats['p50_ms']):>8}ms p95 {_ms(stats['p95_ms']):>8}ms p99 {_ms(stats['p99_ms']):>8}ms "
+                  f"errors {stats['errors']}")
+
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'), 'args': vars(args), 'configs': reports},
+                      f, ensure_ascii=False, indent=2)
+        print(f"Results written to {args.json}")
+    return 1 if any(report['results']['all']['errors'] for report in reports) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+콜백 응답 크기 보고서
+
+요약 페이지와 메뉴 이동 콜백의 응답 크기를 원본/gzip/brotli 기준으로 출력합니다.
+실제 서버 응답의 Content-Encoding 도 함께 확인하여 압축이 켜져 있는지 보여 줍니다.
+년도 변경 시 값만 바꾸는 응답(patch)은 실제 전송 크기가 PATCH_BUDGET_BYTES(수백 바이트)를 넘으면 실패로 표시합니다.
+
+사용 예:
+    python benchmarks/payload_report.py
+    python benchmarks/payload_report.py --json benchmarks/results-payload.json
+"""
+import argparse
+import contextlib
+import gzip
+import io
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ.setdefault('CUK_RELOAD_INTERVAL', '0')
+
+from benchmarks.dash_requests import build_body, find_dependency
+from src.page_registry import PAGES
+from src.pages.summary.summary_layouts import PREVIOUS_YEAR
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MENUS = [page.menu_id for page in PAGES]
+
+# 년도 변경 응답(카드 값 노드와 국가별 그래프만 갱신)의 전송 크기 목표 (압축 후 바이트)
+PATCH_BUDGET_BYTES = int(os.environ.get('CUK_PATCH_BUDGET_BYTES', '800'))
+
+
+def collect():
+    with contextlib.redirect_stdout(io.StringIO()):
+        import run
+    from src import page_registry
+    client = run.server.test_client()
+    dependencies = client.get('/_dash-dependencies').get_json()
+    summary = find_dependency(dependencies, 'summary-content')
+    pages = find_dependency(dependencies, 'page-content')
+    trend_states = [0, 1] if any(item['id'] == 'trend-button' for item in summary['inputs']) else [0]
+
+    requests = []
+    for menu in MENUS:
+        values = {f'{m}.n_clicks': int(m == menu) for m in MENUS}
+        requests.append((f'display_page[{menu}]', build_body(pages, values, [f'{menu}.n_clicks'])))
+    for year in page_registry.page_data('summary')['metric_store'].years('reputation'):
+        for trend in trend_states:
+            values = {'year-selector.value': year, 'trend-button.n_clicks': trend}
+            requests.append((f'update_summary_layout[year={year},trend={trend}]', build_body(summary, values, ['year-selector.value'])))
+    # 표시 중인 최신 년도에서 다른 년도로 바꾸는 부분 업데이트(Patch) 응답
+    if any(item['id'] == 'summary-shown' for item in summary['state']):
+        years = page_registry.page_data('summary')['metric_store'].years('reputation')
+        shown = {'version': page_registry.page_data('summary')['data_version'], 'year': years[-1], 'base_year': PREVIOUS_YEAR}
+        for year in years[:-1]:
+            values = {'year-selector.value': year, 'base-year-selector.value': PREVIOUS_YEAR, 'summary-shown.data': shown}
+            requests.append((f'update_summary_layout[year={year},patch]', build_body(summary, values, ['year-selector.value'])))
+
+    rows = []
+    for name, body in requests:
+        raw = client.post('/_dash-update-component', json=body).get_data()
+        encoded = client.post('/_dash-update-component', json=body, headers={'Accept-Encoding': 'br, gzip'})
+        rows.append({
+            'name': name,
+            'raw_bytes': len(raw),
+            'gzip_bytes': len(gzip.compress(raw, 6)),
+            'brotli_bytes': len(brotli.compress(raw)) if brotli else None,
+            'served_encoding': encoded.headers.get('Content-Encoding', 'identity'),
+            'served_bytes': len(encoded.get_data()),
+        })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--json', help='결과를 저장할 JSON 파일 경로')
+    parser.add_argument('--patch-budget', type=int, default=PATCH_BUDGET_BYTES, help='년도 변경 응답의 최대 전송 크기(바이트)')
+    args = parser.parse_args(argv)
+
+    rows = collect()
+    print(f"{'callback':<45} {'raw':>8} {'gzip':>8} {'brotli':>8} {'served':>14}")
+    over = []
+    for row in rows:
+        brotli_bytes = row['brotli_bytes'] if row['brotli_bytes'] is not None else '-'
+        served = f"{row['served_bytes']} {row['served_encoding']}"
+        print(f"{row['name']:<45} {row['raw_bytes']:>8} {row['gzip_bytes']:>8} {brotli_bytes:>8} {served:>14}")
+        if row['name'].endswith(',patch]') and row['served_bytes'] > args.patch_budget:
+            over.append(row)
+    patches = [row['served_bytes'] for row in rows if row['name'].endswith(',patch]')]
+    if patches:
+        print(f"patch responses: {min(patches)}-{max(patches)} bytes served (budget {args.patch_budget})")
+    for row in over:
+        print(f"OVER BUDGET {row['name']}: {row['served_bytes']} bytes > {args.patch_budget}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+    return 1 if over else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
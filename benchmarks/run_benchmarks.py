@@ -0,0 +1,346 @@
+"""
+대시보드 성능 벤치마크
+
+요약 페이지 콜백(모든 년도 x 토글 상태), 메뉴 이동 콜백(모든 메뉴), 추이 그래프 생성 함수,
+run 모듈의 콜드 임포트를 시간과 메모리 기준으로 측정합니다. 콜백은 응답 캐시를 매번 비우고 측정하며,
+캐시 적중 시간은 response_cache.hit 항목으로 따로 기록합니다.
+현재 데이터(3행 규모)부터 수천 행(년도 x 기관)의 합성 데이터까지 규모를 바꿔 가며 실행하고,
+결과를 JSON 으로 저장하여 릴리스 간 회귀 여부를 비교할 수 있습니다.
+
+사용 예:
+    python benchmarks/run_benchmarks.py --scales 3,300,3000 --output benchmarks/results.json
+    python benchmarks/run_benchmarks.py --compare benchmarks/results-previous.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+# 벤치마크 중에는 백그라운드 데이터 감시를 끕니다.
+os.environ.setdefault('CUK_RELOAD_INTERVAL', '0')
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.dash_requests import build_body, find_dependency
+from src.country_mix import CountryMix
+from src.page_registry import PAGES
+from src.pages.summary.summary_layouts import PREVIOUS_YEAR
+from src.peer_benchmark import HOME_INSTITUTION, build_peer_benchmark
+
+DEFAULT_THRESHOLDS = os.path.join(ROOT, 'benchmarks', 'thresholds.json')
+MENUS = [page.menu_id for page in PAGES]
+# 합성 데이터의 국가 수
+COUNTRIES = 120
+
+
+def make_synthetic_data(rows, institutions=1, seed=0):
+    """
+    rows 행(년도 x 기관) 규모의 합성 데이터셋을 만듭니다. 컬럼 구성은 실제 엑셀과 같습니다.
+    순위는 숫자와 '801-850' 같은 범위 문자열이 섞이도록 생성합니다.
+    """
+    rng = np.random.default_rng(seed)
+    years_count = max(rows // institutions, 1)
+    years = np.repeat(np.arange(2026 - years_count + 1, 2027), institutions)
+    n = len(years)
+
+    def ranks(low, high):
+        values = rng.integers(low, high, n)
+        banded = rng.random(n) < 0.5
+        text = np.where(banded, [f'{v - v % 50 + 1}-{v - v % 50 + 50}' for v in values], values.astype(str))
+        return pd.Series(text, dtype=object).where(rng.random(n) > 0.1)
+
+    reputation = pd.DataFrame({
+        'Year': years,
+        'Institution': np.tile([f'INST{i:04d}' for i in range(institutions)], years_count),
+        'QS_Rank': ranks(400, 1200), 'QS_Rank_Domestic': rng.integers(1, 60, n).astype(float),
+        'THE_Rank': ranks(400, 1500), 'THE_Rank_Domestic': rng.integers(1, 60, n).astype(float),
+        'ARWU_Rank': ranks(400, 1000), 'ARWU_Rank_Domestic': ranks(1, 60),
+        'QS_Overall': rng.random(n) * 100,
+        'QS_Academic_Reputation': rng.random(n) * 100,
+    })
+    simple_years = np.arange(2026 - years_count + 1, 2027)
+    m = len(simple_years)
+    research = pd.DataFrame({'Year': simple_years, 'Funding': rng.integers(50, 500, m), 'Citation': rng.integers(500, 5000, m)})
+    cooperation = pd.DataFrame({
+        'Year': simple_years, 'Tech_transfer': rng.integers(1, 30, m), 'Patent_application': rng.integers(10, 200, m),
+        'Patent_registration': rng.integers(10, 150, m), 'Internship_rate': rng.random(m),
+    })
+    # 국가별 유학생 수: 실제 데이터처럼 100개 이상의 국가 컬럼을 두고, 국가마다 규모가 다르게 생성합니다.
+    countries = {f'COUNTRY{i:03d}': rng.integers(0, 800, m) // (i + 1) for i in range(COUNTRIES)}
+    global_ = pd.DataFrame({
+        'Year': simple_years, **countries, '기타': rng.integers(10, 300, m),
+    })
+    global_['Total_students'] = global_.drop(columns='Year').sum(axis=1)
+    # 비교 순위표: 최근 20년 x 기관 x 순위 기관의 long format. 기관 수는 실제 순위표처럼 수백 개 이상으로 둡니다.
+    peer_count = max(institutions, 300)
+    peer_year_range = simple_years[-20:]
+    peer_years = np.repeat(peer_year_range, peer_count * 3)
+    p = len(peer_years)
+    names = [HOME_INSTITUTION] + [f'PEER{i:04d}' for i in range(1, peer_count)]
+    peer_ranks = rng.integers(1, 1500, p)
+    peers = pd.DataFrame({
+        'Year': peer_years,
+        'Institution': np.tile(np.repeat(names, 3), len(peer_year_range)),
+        'Country': np.tile(np.repeat(rng.choice(['KR', 'JP', 'CN', 'US'], peer_count), 3), len(peer_year_range)),
+        'Ranking': np.tile(['QS', 'THE', 'ARWU'], peer_count * len(peer_year_range)),
+        'Rank': np.where(rng.random(p) < 0.5, [f'{v - v % 50 + 1}-{v - v % 50 + 50}' for v in peer_ranks], peer_ranks.astype(str)),
+    })
+    return {'df_reputation': reputation, 'df_research': research, 'df_cooperation': cooperation, 'df_global': global_, 'df_peers': peers}
+
+
+def measure(func, repeat):
+    """
+    func 를 한 번 예열한 뒤 repeat 번 실행한 시간(ms)과, tracemalloc 으로 측정한 1회 최대 할당량을 반환합니다.
+    """
+    func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    timings.sort()
+    return {
+        'min_ms': timings[0],
+        'median_ms': statistics.median(timings),
+        'p95_ms': timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        'mean_ms': statistics.fmean(timings),
+        'peak_kib': peak / 1024,
+        'runs': repeat,
+    }
+
+
+def sample_years(years, limit):
+    if len(years) <= limit:
+        return list(years)
+    return [years[int(i)] for i in np.linspace(0, len(years) - 1, limit)]
+
+
+def bench_app(scale, institutions, repeat, max_years):
+    """
+    합성 데이터를 앱에 올린 뒤 콜백과 그래프 생성 함수를 측정합니다.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        import run
+    from src import data_reload, figure_cache, page_registry, response_cache
+    from src.pages.summary import summary_figures
+
+    data = dict(page_registry.page_data('summary'))
+    if scale is not None:
+        data.update(make_synthetic_data(scale, institutions))
+    data = data_reload.attach_derived(data)
+    data_reload.publish(data)
+    figure_cache.invalidate()
+
+    client = run.server.test_client()
+    dependencies = client.get('/_dash-dependencies').get_json()
+    summary = find_dependency(dependencies, 'summary-content')
+    pages = find_dependency(dependencies, 'page-content')
+    trend_states = [0, 1] if any(item['id'] == 'trend-button' for item in summary['inputs']) else [0]
+
+    def post(body, cached=False):
+        # 같은 본문을 반복하면 두 번째부터 응답 캐시(response_cache)가 답하므로, 콜백 자체를 재려면 매번 비웁니다.
+        if not cached:
+            response_cache.invalidate()
+        response = client.post('/_dash-update-component', json=body)
+        if response.status_code != 200:
+            raise RuntimeError(f"{body['output']} -> HTTP {response.status_code}")
+        return response
+
+    results = []
+    for year in sample_years(data['metric_store'].years('reputation'), max_years):
+        for trend in trend_states:
+            body = build_body(summary, {'year-selector.value': year, 'trend-button.n_clicks': trend}, ['year-selector.value'])
+            stats = measure(lambda: post(body), repeat)
+            stats['response_bytes'] = len(post(body).data)
+            results.append({'group': 'update_summary_layout', 'name': f'update_summary_layout[year={year},trend={trend}]', **stats})
+    # 표시 중인 최신 년도에서 다른 년도로 바꾸는 부분 업데이트(Patch) 요청
+    if any(item['id'] == 'summary-shown' for item in summary['state']):
+        years = data['metric_store'].years('reputation')
+        shown = {'version': data['data_version'], 'year': years[-1], 'base_year': PREVIOUS_YEAR}
+        for year in sample_years(years[:-1], max_years):
+            values = {'year-selector.value': year, 'base-year-selector.value': PREVIOUS_YEAR, 'summary-shown.data': shown}
+            body = build_body(summary, values, ['year-selector.value'])
+            stats = measure(lambda: post(body), repeat)
+            stats['response_bytes'] = len(post(body).data)
+            results.append({'group': 'update_summary_layout', 'name': f'update_summary_layout[year={year},patch]', **stats})
+
+    for menu in MENUS:
+        values = {f'{m}.n_clicks': int(m == menu) for m in MENUS}
+        body = build_body(pages, values, [f'{menu}.n_clicks'])
+        stats = measure(lambda: post(body), repeat)
+        stats['response_bytes'] = len(post(body).data)
+        results.append({'group': 'display_page', 'name': f'display_page[{menu}]', **stats})
+
+    # 응답 캐시 적중 시간은 콜백 측정과 따로 기록합니다 (요약 화면 최신 년도, 첫 화면 메뉴).
+    latest = data['metric_store'].years('reputation')[-1]
+    hits = [
+        ('update_summary_layout', build_body(summary, {'year-selector.value': latest, 'base-year-selector.value': PREVIOUS_YEAR,
+                                                       'trend-button.n_clicks': 0}, ['year-selector.value'])),
+        ('display_page', build_body(pages, {f'{m}.n_clicks': int(m == MENUS[0]) for m in MENUS}, [f'{MENUS[0]}.n_clicks'])),
+    ]
+    for name, body in hits:
+        post(body)
+        stats = measure(lambda: post(body, cached=True), repeat)
+        results.append({'group': 'response_cache.hit', 'name': f'response_cache.hit[{name}]', **stats})
+
+    if 'country_mix' in data:
+        table = data['country_mix'].table
+        results.append({'group': 'country_mix.build', 'name': f"CountryMix[{len(table)} rows]", **measure(lambda: CountryMix(table).trend(), repeat)})
+
+    if data.get('df_peers') is not None and not data['df_peers'].empty:
+        results.append({'group': 'peer_benchmark.build', 'name': f"build_peer_benchmark[{len(data['df_peers'])} rows]", **measure(lambda: build_peer_benchmark(data), repeat)})
+
+    for name in ['reputation', 'research', 'cooperation', 'global']:
+        builder = getattr(summary_figures, f'get_{name}_trend_figure')
+        results.append({'group': f'figure.{name}_trend', 'name': f'get_{name}_trend_figure', **measure(lambda: builder(data), repeat)})
+    return results
+
+
+def bench_cold_import(repeat):
+    """
+    새 프로세스에서 run 모듈을 임포트하는 시간과 최대 상주 메모리를 측정합니다.
+    스냅샷이 없는 첫 부팅과 스냅샷이 있는 이후 부팅을 나누어 측정합니다.
+    빠른 부팅(boot 모듈)은 요청을 받을 수 있을 때까지(fast_boot)와 첫 화면 준비가 끝날 때까지(fast_boot_ready)를 측정합니다.
+    """
+    probe = (
+        "import json, resource, time\n"
+        "start = time.perf_counter()\n"
+        "import run\n"
+        "elapsed = (time.perf_counter() - start) * 1000\n"
+        "print(json.dumps({'ms': elapsed, 'maxrss_kib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}))\n"
+    )
+    boot_probe = (
+        "import json, resource, time\n"
+        "start = time.perf_counter()\n"
+        "import boot\n"
+        "elapsed = (time.perf_counter() - start) * 1000\n"
+        "boot._ready.wait()\n"
+        "assert boot.status()['ready'], 'warm-up failed'\n"
+        "ready = (time.perf_counter() - start) * 1000\n"
+        "print(json.dumps({'ms': {'cold_import.fast_boot': elapsed, 'cold_import.fast_boot_ready': ready},\n"
+        "                  'maxrss_kib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}))\n"
+    )
+    results = []
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        env = dict(os.environ, CUK_SNAPSHOT_DIR=snapshot_dir, CUK_SHARED_DATA='0')
+        for name in ['cold_import.no_snapshot', 'cold_import.snapshot', 'cold_import.fast_boot', 'cold_import.fast_boot_ready']:
+            runs = []
+            for _ in range(repeat):
+                if name == 'cold_import.no_snapshot':
+                    for entry in os.listdir(snapshot_dir):
+                        os.remove(os.path.join(snapshot_dir, entry))
+                if name.startswith('cold_import.fast_boot'):
+                    output = subprocess.run([sys.executable, '-c', boot_probe], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+                    run_result = json.loads(output.stdout.strip().splitlines()[-1])
+                    runs.append(dict(run_result, ms=run_result['ms'][name]))
+                    continue
+                output = subprocess.run([sys.executable, '-c', probe], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+                runs.append(json.loads(output.stdout.strip().splitlines()[-1]))
+            timings = sorted(r['ms'] for r in runs)
+            results.append({
+                'group': name, 'name': name,
+                'min_ms': timings[0], 'median_ms': statistics.median(timings), 'p95_ms': timings[-1],
+                'mean_ms': statistics.fmean(timings), 'maxrss_kib': max(r['maxrss_kib'] for r in runs), 'runs': repeat,
+            })
+    return results
+
+
+def check_thresholds(results, thresholds):
+    """
+    thresholds({'그룹@규모': 최대 중앙값 ms})를 넘는 항목을 찾습니다.
+    """
+    failures = []
+    for result in results:
+        limit = thresholds.get(f"{result['group']}@{result['scale']}")
+        if limit is not None and result['median_ms'] > limit:
+            failures.append(f"{result['name']}@{result['scale']}: median {result['median_ms']:.2f}ms > budget {limit}ms")
+    return failures
+
+
+def compare(results, baseline, tolerance):
+    """
+    이전 결과 파일과 비교하여 중앙값이 tolerance 비율 이상 느려진 항목을 찾습니다.
+    """
+    previous = {(r['name'], r['scale']): r for r in baseline['results']}
+    regressions = []
+    for result in results:
+        before = previous.get((result['name'], result['scale']))
+        if before and result['median_ms'] > before['median_ms'] * (1 + tolerance):
+            regressions.append(
+                f"{result['name']}@{result['scale']}: {before['median_ms']:.2f}ms -> {result['median_ms']:.2f}ms")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', default='3,300,3000', help="쉼표로 구분한 합성 데이터 행 수. 'data' 는 실제 data/ 데이터")
+    parser.add_argument('--institutions', type=int, default=10, help='합성 평판도 데이터의 년도당 기관 수 (3행 규모에서는 1)')
+    parser.add_argument('--repeat', type=int, default=10, help='항목별 반복 측정 횟수')
+    parser.add_argument('--max-years', type=int, default=12, help='규모가 클 때 측정할 최대 년도 수')
+    parser.add_argument('--import-repeat', type=int, default=3, help='콜드 임포트 반복 횟수 (0 이면 생략)')
+    parser.add_argument('--output', default=os.path.join(ROOT, 'benchmarks', 'results.json'))
+    parser.add_argument('--thresholds', default=DEFAULT_THRESHOLDS)
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON 파일')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='--compare 시 허용하는 중앙값 증가 비율')
+    args = parser.parse_args(argv)
+
+    results = []
+    for scale_text in args.scales.split(','):
+        scale = None if scale_text == 'data' else int(scale_text)
+        institutions = 1 if scale is None or scale <= 3 else args.institutions
+        for result in bench_app(scale, institutions, args.repeat, args.max_years):
+            results.append({'scale': scale_text, **result})
+    if args.import_repeat > 0:
+        for result in bench_cold_import(args.import_repeat):
+            results.append({'scale': 'data', **result})
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'packages': {name: __import__(name).__version__ for name in ['dash', 'pandas', 'numpy', 'plotly']},
+            'args': vars(args),
+        },
+        'results': results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    for result in results:
+        print(f"{result['scale']:>6} {result['name']:<55} median {result['median_ms']:9.3f}ms  p95 {result['p95_ms']:9.3f}ms")
+    print(f"Results written to {args.output}")
+
+    problems = []
+    if args.thresholds and os.path.exists(args.thresholds):
+        with open(args.thresholds, encoding='utf-8') as f:
+            problems += check_thresholds(results, json.load(f))
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            problems += compare(results, json.load(f), args.tolerance)
+    for problem in problems:
+        print(f"REGRESSION {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+빠른 부팅(fast boot) 진입점
+
+    gunicorn -b :$PORT boot:server
+
+run.py 는 dash, pandas, plotly 임포트와 첫 화면 데이터 로드까지 1초 이상 걸리므로, 이 모듈은 표준 라이브러리만
+임포트하고 바로 요청을 받을 수 있게 합니다. 무거운 준비 작업은 백그라운드 스레드에서 단계별로 진행합니다.
+
+    1. import  - run 모듈 임포트 (Dash 앱, 콜백 등록, 공통 데이터)
+    2. data    - 첫 화면(요약) 페이지의 데이터 로드
+    3. render  - 첫 화면 레이아웃을 한 번 만들어 그래프 캐시를 채움
+
+준비가 끝나기 전의 요청은 다음과 같이 처리합니다.
+    - 브라우저의 페이지 요청(Accept: text/html): 준비 상태를 확인하다가 끝나면 새로고침하는 안내 페이지
+    - /_boot-status: 단계별 소요 시간을 담은 JSON (준비가 끝난 뒤에도 응답합니다)
+    - 그 밖의 요청(/_ah/warmup 포함): 준비가 끝날 때까지 기다렸다가 run.server 로 전달하며,
+      CUK_BOOT_TIMEOUT(초) 안에 끝나지 않거나 준비에 실패하면 503 을 반환합니다.
+준비가 끝난 뒤에는 /_boot-status 를 제외한 모든 요청을 그대로 run.server 로 전달합니다.
+
+스레드는 fork 후 자식 프로세스로 이어지지 않으므로 gunicorn preload 모드와 함께 쓰지 않습니다 (CUK_FAST_BOOT=1).
+"""
+import importlib
+import json
+import os
+import threading
+import time
+import traceback
+
+# 준비 중 요청이 기다리는 최대 시간(초)
+BOOT_TIMEOUT = float(os.environ.get('CUK_BOOT_TIMEOUT', '60'))
+STATUS_PATH = '/_boot-status'
+
+_ready = threading.Event()
+_state = {'phase': 'starting', 'error': None, 'timings': {}}
+_started = time.perf_counter()
+_app = None
+
+LOADING_PAGE = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<title>CUK 대시보드</title>
+<link rel="stylesheet" href="{prefix}/assets/style.css">
+</head>
+<body>
+<p id="boot-message">대시보드를 준비하고 있습니다...</p>
+<script>
+(function poll() {{
+    fetch('{prefix}{status}', {{cache: 'no-store'}}).then(function(res) {{ return res.json(); }}).then(function(state) {{
+        if (state.ready) {{ location.reload(); return; }}
+        if (state.error) {{ document.getElementById('boot-message').textContent = '대시보드를 준비하지 못했습니다. 관리자에게 문의하세요.'; return; }}
+        setTimeout(poll, 300);
+    }}, function() {{ setTimeout(poll, 1000); }});
+}})();
+</script>
+</body>
+</html>
+"""
+
+
+def _phase(name, func):
+    _state['phase'] = name
+    start = time.perf_counter()
+    result = func()
+    _state['timings'][name] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def _warm_up():
+    global _app
+    try:
+        run = _phase('import', lambda: importlib.import_module('run'))
+        from src import page_registry
+        _phase('data', lambda: page_registry.preload([page_registry.DEFAULT_PAGE]))
+        _phase('render', lambda: page_registry.render(page_registry.DEFAULT_PAGE))
+        _app = run.server
+        _state['phase'] = 'ready'
+        _state['timings']['total'] = round(time.perf_counter() - _started, 3)
+        print(f"Warm-up finished in {_state['timings']['total']:.2f}s ({_state['timings']})")
+    except Exception:
+        _state['phase'] = 'failed'
+        _state['error'] = traceback.format_exc()
+        print(f"Warm-up failed:\n{_state['error']}")
+    finally:
+        _ready.set()
+
+
+def status():
+    """
+    준비 상태(ready, 현재 단계, 단계별 소요 시간(초), 실패 여부)를 반환합니다.
+    """
+    return {
+        'ready': _app is not None,
+        'phase': _state['phase'],
+        'timings': dict(_state['timings']),
+        'error': _state['error'] is not None,
+    }
+
+
+def _respond(start_response, status_line, body, content_type, headers=()):
+    body = body.encode('utf-8')
+    start_response(status_line, [
+        ('Content-Type', content_type), ('Content-Length', str(len(body))), ('Cache-Control', 'no-store'), *headers,
+    ])
+    return [body]
+
+
+def server(environ, start_response):
+    """
+    WSGI 앱. 준비가 끝나면 run.server 로 전달합니다.
+    """
+    if environ.get('PATH_INFO') == STATUS_PATH:
+        return _respond(start_response, '200 OK', json.dumps(status()), 'application/json')
+    if _app is not None:
+        return _app(environ, start_response)
+
+    if environ.get('REQUEST_METHOD') == 'GET' and 'text/html' in environ.get('HTTP_ACCEPT', '') and not _ready.is_set():
+        page = LOADING_PAGE.format(prefix=environ.get('SCRIPT_NAME', ''), status=STATUS_PATH)
+        return _respond(start_response, '200 OK', page, 'text/html; charset=utf-8')
+
+    _ready.wait(BOOT_TIMEOUT)
+    if _app is None:
+        return _respond(start_response, '503 Service Unavailable', '대시보드를 준비하고 있습니다.',
+                        'text/plain; charset=utf-8', [('Retry-After', '5')])
+    return _app(environ, start_response)
+
+
+threading.Thread(target=_warm_up, name='warm-up', daemon=True).start()
@@ -0,0 +1,265 @@
+"""
+정적 사이트 내보내기
+
+run.py 의 앱으로 대시보드를 미리 렌더링하여, Dash 서버 없이 정적 파일 서버나 CDN 에서 열 수 있는
+HTML 과 JSON 조각(fragment)으로 저장합니다. 데이터(엑셀)가 바뀔 때마다 다시 실행합니다.
+
+출력 구성:
+    index.html                    Dash 렌더러 + 콜백 요청을 JSON 조각으로 연결하는 스크립트
+    _dash-component-suites/ ...   Dash/Plotly 자바스크립트 (assets/ 포함)
+    fragments/layout.json         앱 레이아웃 (/_dash-layout)
+    fragments/dependencies.json   콜백 목록 (/_dash-dependencies)
+    fragments/callbacks.json      콜백별 입력값 -> 응답 조각 파일 목록
+    fragments/<해시>.json         콜백 응답 (같은 응답은 한 파일을 공유)
+
+메뉴 이동, 년도/비교 기준 선택, 추이보기 토글처럼 입력값을 나열할 수 있는 콜백은 모든 조합을 미리 저장합니다.
+그래프 확대처럼 입력값을 나열할 수 없는 콜백은 내보내지 않으며, 정적 사이트에서는 브라우저의 확대만 동작합니다.
+보고서 내보내기 같은 백그라운드 콜백도 서버에서 작업을 실행해야 하므로 내보내지 않습니다.
+페이지를 page_registry 에 추가하면 그 페이지의 드롭다운/버튼 콜백도 같은 규칙으로 함께 내보내집니다.
+
+사용 예:
+    python export_static.py
+    python export_static.py --output dist/static
+    python -m http.server -d dist/static    # 내보낸 사이트 확인
+"""
+import argparse
+import contextlib
+import hashlib
+import io
+import itertools
+import json
+import os
+import re
+import shutil
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+# 내보내는 동안 데이터가 바뀌지 않도록 변경 감지는 끕니다.
+os.environ.setdefault('CUK_RELOAD_INTERVAL', '0')
+
+from benchmarks.dash_requests import build_body, split_output
+
+DEFAULT_OUTPUT = os.path.join(ROOT, 'dist', 'static')
+
+# 콜백 요청(fetch)을 미리 저장한 JSON 조각으로 바꿔 주는 스크립트. 키 규칙은 _key() 와 같아야 합니다.
+# - '@triggered': 콜백을 발생시킨 입력 (메뉴 버튼처럼 어느 버튼이 눌렸는지만 중요한 경우)
+# - 'id.prop%2': 클릭 수의 홀짝 (토글 버튼)
+# - 'id.prop': 입력값
+SHIM = """<script>
+(function() {
+    var realFetch = window.fetch.bind(window);
+    var manifest = null;
+    function fragment(name) {
+        return realFetch(new URL('fragments/' + name, location.href));
+    }
+    function keyPart(part, values, changed) {
+        if (part === '@triggered') { return changed[0] || ''; }
+        if (part.slice(-2) === '%2') { return String((Number(values[part.slice(0, -2)]) || 0) % 2); }
+        var value = values[part];
+        return value === null || value === undefined ? '' : String(value);
+    }
+    window.fetch = function(url, options) {
+        var path = String(url).split('?')[0];
+        if (/_dash-layout$/.test(path)) { return fragment('layout.json'); }
+        if (/_dash-dependencies$/.test(path)) { return fragment('dependencies.json'); }
+        if (!/_dash-update-component$/.test(path)) { return realFetch(url, options); }
+
+        var body = JSON.parse(options.body);
+        manifest = manifest || fragment('callbacks.json').then(function(res) { return res.json(); });
+        return manifest.then(function(callbacks) {
+            var entry = callbacks[body.output];
+            if (entry) {
+                var values = {};
+                (body.inputs || []).concat(body.state || []).forEach(function(item) {
+                    values[item.id + '.' + item.property] = item.value;
+                });
+                var key = entry.key.map(function(part) {
+                    return keyPart(part, values, body.changedPropIds || []);
+                }).join('|');
+                if (entry.responses[key]) { return fragment(entry.responses[key]); }
+            }
+            // 저장되지 않은 조합은 PreventUpdate 와 같이 화면을 바꾸지 않습니다.
+            return new Response(null, {status: 204});
+        });
+    };
+})();
+</script>
+"""
+
+
+def _key_value(value):
+    # 브라우저의 String(value) 와 같은 문자열을 만듭니다 (2024.0 -> '2024').
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _key(parts, values, triggered):
+    result = []
+    for part in parts:
+        if part == '@triggered':
+            result.append(triggered[0] if triggered else '')
+        elif part.endswith('%2'):
+            result.append(str((values.get(part[:-2]) or 0) % 2))
+        else:
+            result.append(_key_value(values.get(part)))
+    return '|'.join(result)
+
+
+def _collect_options(tree, options):
+    """
+    레이아웃/콜백 응답 JSON 에서 options 를 가진 컴포넌트(드롭다운 등)의 선택 가능한 값을 모읍니다.
+    """
+    if isinstance(tree, dict):
+        props = tree.get('props')
+        if isinstance(props, dict) and isinstance(props.get('id'), str) and isinstance(props.get('options'), list):
+            values = [item.get('value') if isinstance(item, dict) else item for item in props['options']]
+            options.setdefault(f"{props['id']}.value", [])
+            options[f"{props['id']}.value"].extend(value for value in values if value not in options[f"{props['id']}.value"])
+        for value in tree.values():
+            _collect_options(value, options)
+    elif isinstance(tree, list):
+        for value in tree:
+            _collect_options(value, options)
+
+
+def _variants(dependency, options, menus):
+    """
+    콜백의 입력값 조합을 (키 규칙, [(입력값, triggered), ...]) 로 반환합니다. 나열할 수 없는 입력이 있으면 None 입니다.
+    """
+    inputs = [f"{item['id']}.{item['property']}" for item in dependency['inputs']]
+    if any(not isinstance(item['id'], str) for item in dependency['inputs']):
+        return None
+
+    triggers = [prop for prop in inputs if prop.split('.')[0] in menus]
+    parts, candidates = (['@triggered'] if triggers else []), []
+    for prop in inputs:
+        if prop in triggers:
+            continue
+        if prop.endswith('.n_clicks'):
+            parts.append(f'{prop}%2')
+            candidates.append((prop, [0, 1]))
+        elif prop in options:
+            parts.append(prop)
+            candidates.append((prop, options[prop]))
+        else:
+            return None
+
+    variants = []
+    for triggered in ([None] + triggers if triggers else [None]):
+        for combination in itertools.product(*(values for _, values in candidates)):
+            values = {prop: int(prop == triggered) for prop in triggers}
+            values.update(zip((prop for prop, _ in candidates), combination))
+            variants.append((values, [triggered] if triggered else []))
+    return parts, variants
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def _rewrite_index(html):
+    """
+    index.html 의 절대 경로(/...)를 상대 경로(./...)로 바꾸고 콜백 연결 스크립트를 넣습니다.
+    하위 경로(https://cdn/.../dashboard/)에 올려도 동작하도록 합니다.
+    """
+    html = re.sub(r'(src|href)="/(?!/)', r'\1="./', html)
+    html = html.replace('"requests_pathname_prefix":"\\u002f"', '"requests_pathname_prefix":".\\u002f"')
+    return html.replace('<script id="_dash-renderer"', SHIM + '<script id="_dash-renderer"', 1)
+
+
+def export(output, quiet=False):
+    """
+    앱을 output 디렉터리에 정적 사이트로 내보내고 콜백별 조각 수를 반환합니다.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        import run
+    from src import page_registry
+
+    client = run.server.test_client()
+    menus = {page.menu_id for page in page_registry.PAGES}
+    if os.path.isdir(output) and os.listdir(output):
+        # 이전에 내보낸 디렉터리만 지웁니다.
+        if not os.path.isfile(os.path.join(output, 'fragments', 'callbacks.json')):
+            raise SystemExit(f'{output} 은 비어 있지 않고 내보내기 결과도 아닙니다. 다른 --output 을 지정하세요.')
+        shutil.rmtree(output)
+
+    # 1. 페이지 뼈대와 자바스크립트/CSS
+    html = client.get('/').get_data(as_text=True)
+    urls = set(re.findall(r'(?:src|href)="/(?!/)([^"]+)"', html))
+    for package, paths in run.app.registered_paths.items():
+        urls.update(f'_dash-component-suites/{package}/{path}' for path in paths if not path.endswith('.map'))
+    for url in sorted(urls):
+        response = client.get('/' + url)
+        if response.status_code == 200:
+            _write(os.path.join(output, url.split('?')[0]), response.get_data())
+    _write(os.path.join(output, 'index.html'), _rewrite_index(html).encode('utf-8'))
+
+    # 2. 레이아웃과 콜백 목록
+    fragments = os.path.join(output, 'fragments')
+    layout = client.get('/_dash-layout').get_data()
+    dependencies = client.get('/_dash-dependencies').get_json()
+    _write(os.path.join(fragments, 'layout.json'), layout)
+    _write(os.path.join(fragments, 'dependencies.json'), json.dumps(dependencies).encode('utf-8'))
+
+    # 3. 콜백 응답. 메뉴 이동 응답(페이지 레이아웃)에서 새 드롭다운 값이 나오면 그 페이지의 콜백을 이어서 내보냅니다.
+    options = {}
+    _collect_options(json.loads(layout), options)
+    # 백그라운드 콜백(보고서 내보내기 등)은 작업 요청/결과 확인으로 나뉘어 미리 저장할 수 없으므로 제외합니다.
+    # Dash 가 취소 버튼마다 등록하는 작업 중단 콜백(출력이 '<버튼 id>.id')도 함께 제외합니다.
+    pending = [
+        dependency for dependency in dependencies
+        if not dependency.get('clientside_function') and not dependency.get('background')
+        and not all(prop == 'id' for _, prop in split_output(dependency['output']))
+    ]
+    callbacks, written = {}, set()
+    while pending:
+        progress = False
+        for dependency in list(pending):
+            variants = _variants(dependency, options, menus)
+            if variants is None:
+                continue
+            pending.remove(dependency)
+            progress = True
+            parts, combinations = variants
+            entry = callbacks[dependency['output']] = {'key': parts, 'responses': {}}
+            for values, triggered in combinations:
+                response = client.post('/_dash-update-component', json=build_body(dependency, values, triggered))
+                if response.status_code != 200:
+                    continue
+                data = response.get_data()
+                name = hashlib.sha256(data).hexdigest()[:16] + '.json'
+                if name not in written:
+                    _write(os.path.join(fragments, name), data)
+                    written.add(name)
+                    _collect_options(response.get_json(), options)
+                entry['responses'][_key(parts, values, triggered)] = name
+        if not progress:
+            break
+    _write(os.path.join(fragments, 'callbacks.json'), json.dumps(callbacks, ensure_ascii=False).encode('utf-8'))
+
+    if not quiet:
+        for output_id, entry in callbacks.items():
+            names = ', '.join(component_id for component_id, _ in split_output(output_id))
+            print(f"{names}: {len(entry['responses'])}개 조합 ({' x '.join(entry['key'])})")
+        for dependency in pending:
+            print(f"건너뜀 (입력값을 나열할 수 없음): {dependency['output']}")
+        print(f"{output} 에 조각 {len(written)}개를 저장했습니다.")
+    return {output_id: len(entry['responses']) for output_id, entry in callbacks.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='내보낼 디렉터리 (이전 내보내기 결과는 지워집니다)')
+    args = parser.parse_args()
+    export(args.output)
+
+
+if __name__ == '__main__':
+    main()
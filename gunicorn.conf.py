@@ -0,0 +1,29 @@
+import os
+
+# gunicorn 설정 (app.yaml 의 "gunicorn -b :$PORT boot:server" 실행 시 자동으로 읽힙니다.)
+
+# 빠른 부팅(CUK_FAST_BOOT=1, boot.py)에서는 워커가 바로 요청을 받고 run.py 는 워커의 백그라운드 스레드에서
+# 임포트됩니다. 스레드는 fork 후 이어지지 않으므로 이때는 preload 를 사용하지 않습니다.
+FAST_BOOT = os.environ.get('CUK_FAST_BOOT', '0') == '1'
+
+# 워커 프로세스 수와 워커당 스레드 수. 인스턴스 크기에 맞는 값은 benchmarks/load_test.py 로 설정별
+# 처리량과 지연시간을 비교해 정하고 app.yaml 의 env_variables 에 적습니다. 명령행의 -w/--threads 가 우선합니다.
+# 스레드가 2 이상이면 gthread 워커로 실행됩니다. 데이터는 읽기 전용 스냅샷으로 공유되므로 한 프로세스의 여러
+# 스레드가 동시에 요청을 처리해도 안전하며(src/snapshot.py), 워커를 늘리는 것과 달리 메모리가 늘지 않습니다.
+workers = int(os.environ.get('CUK_WORKERS', '1'))
+threads = int(os.environ.get('CUK_THREADS', '1'))
+
+# 마스터 프로세스가 run.py 를 한 번만 임포트하여 데이터와 plotly 등을 로드하고,
+# 워커들은 fork 로 이를 공유합니다. 숫자형 데이터는 메모리 매핑 배열로 바뀌어
+# 워커 수를 늘려도 인스턴스 메모리가 거의 늘지 않습니다. CUK_SHARED_DATA=0 이면 비활성화됩니다.
+preload_app = not FAST_BOOT and os.environ.get('CUK_SHARED_DATA', '1') != '0'
+if preload_app:
+    os.environ['CUK_SHARED_DATA'] = '1'
+
+
+def post_fork(server, worker):
+    # 스레드는 fork 후 자식 프로세스로 이어지지 않으므로, 데이터 변경 감지는 워커마다 시작합니다.
+    # preload 를 하지 않으면 워커에서 임포트되는 run.py 가 직접 시작합니다.
+    if preload_app:
+        from src import data_reload
+        data_reload.start_watcher()
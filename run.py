@@ -1,96 +1,49 @@
 import dash
-from dash import dcc, html
-from dash.dependencies import Input, Output
-import pandas as pd
-import re
-import plotly.graph_objs as go
 
-# 데이터 로딩 (기존 로직 그대로 유지)
-try:
-    df_reputation = pd.read_excel('data/reputation.xlsx')
-except FileNotFoundError as e:
-    print(f"Error: {e}. Please ensure reputation.xlsx is in the 'data' directory. Using temporary data.")
-    df_reputation = pd.DataFrame({
-        'Year': [2024, 2025, 2026],
-        'QS_Rank': [850, 800, 750],
-        'QS_Rank_Domestic': [15, 12, 10],
-        'THE_Rank': [900, 850, 800],
-        'THE_Rank_Domestic': [20, 18, 16],
-        'ARWU_Rank': [700, 650, 600],
-        'ARWU_Rank_Domestic': [10, 9, 8],
-        'QS_Overall': [16.53, 20.0, 30.8],
-        'QS_Academic_Reputation': [4.5, 5.0, 7.9],
-        'QS_Citations_Per_Faculty': [18.1, 25.0, 31.0],
-        'QS_Faculty_Student_Ratio': [85.0, 90.0, 97.4],
-        'QS_Employer_Reputation': [3.2, 4.0, 6.0]
-    })
+from src import background, data_reload, shared_data, metrics, page_registry, response_cache
 
-try:
-    df_research = pd.read_excel('data/research.xlsx')
-except FileNotFoundError as e:
-    print(f"Error: {e}. Please ensure research.xlsx is in the 'data' directory. Using temporary data.")
-    df_research = pd.DataFrame({
-        'Year': [2023, 2024, 2025],
-        'Funding': [100, 120, 150],
-        'Citation': [1500, 1650, 1800]
-    })
-
-try:
-    df_cooperation = pd.read_excel('data/cooperation.xlsx')
-except FileNotFoundError as e:
-    print(f"Error: {e}. Please ensure cooperation.xlsx is in the 'data' directory. Using temporary data.")
-    df_cooperation = pd.DataFrame({
-        'Year': [2023, 2024, 2025],
-        'Tech_transfer': [5, 8, 12],
-        'Patent_application': [50, 60, 70],
-        'Patent_registration': [30, 40, 50],
-        'Internship_rate': [0.15, 0.18, 0.22]
-    })
-
-try:
-    df_global = pd.read_excel('data/global.xlsx')
-except FileNotFoundError as e:
-    print(f"Error: {e}. Please ensure global.xlsx is in the 'data' directory. Using temporary data.")
-    df_global = pd.DataFrame({
-        'Year': [2023, 2024, 2025],
-        'Total_students': [500, 600, 750],
-        '중국': [200, 250, 300],
-        '베트남': [150, 180, 200],
-        '말레이시아': [100, 120, 150],
-        '기타': [50, 50, 100]
-    })
-
-# Dash 앱 초기화
-app = dash.Dash(__name__, external_stylesheets=['/assets/style.css'])
+# Dash 앱 초기화 (compress=True: 콜백 응답과 정적 파일을 Accept-Encoding 에 따라 br/gzip 으로 압축)
+# 오래 걸리는 콜백(background=True)은 디스크 캐시 기반 관리자로 별도 프로세스에서 실행합니다 (CUK_BACKGROUND=0 이면 비활성화).
+app = dash.Dash(__name__, external_stylesheets=['/assets/style.css'], compress=True,
+                background_callback_manager=background.manager())
+# 콜백별 지연시간(데이터 조회/컴포넌트 생성/직렬화) 계측과 /metrics 엔드포인트
+metrics.install(app)
+# 같은 입력·같은 데이터 버전의 콜백 응답을 재사용하는 LRU 캐시 (CUK_RESPONSE_CACHE_MB=0 이면 비활성화)
+response_cache.install(app)
 
 # 다른 파일에서 정의된 레이아웃 및 콜백 함수를 가져옵니다.
 from src.main_layouts import main_layout
 from src.main_callbacks import register_callbacks as register_main_callbacks
-from src.pages.summary.summary_callbacks import register_callbacks as register_summary_callbacks
-# from src.pages.reputation.reputation_layouts import reputation_layout 
-# from src.pages.reputation.reputation_callbacks import register_callbacks as register_reputation_callbacks 
 
-# 전역 데이터프레임과 색상 팔레트를 다른 파일에서 사용하기 위해 전역 변수로 설정
-global_data = {
-    'df_reputation': df_reputation,
-    'df_research': df_research,
-    'df_cooperation': df_cooperation,
-    'df_global': df_global,
-    'item_colors': {
-        'QS': '#1f77b4', 'THE': '#ff7f0e', 'ARWU': '#2ca02c', 'Funding': '#1f77b4', 'Citation': '#ff7f0e',
-        'Tech_transfer': '#1f77b4', 'Patent_application': '#ff7f0e', 'Patent_registration': '#2ca02c',
-        'Internship_rate': '#9467bd', '중국': '#1f77b4', '베트남': '#ff7f0e', '말레이시아': '#2ca02c', '기타': '#7f7f7f'
-    }
+# 색상 팔레트 등 모든 페이지가 공유하는 데이터. 엑셀 데이터는 page_registry 에 선언된 대로
+# 그 데이터를 사용하는 페이지가 처음 요청될 때 로드되어 새 스냅샷에 더해집니다.
+# 국가별 색상은 데이터를 읽을 때 유학생 수 순서로 자동 배정됩니다 (src/country_mix.py).
+ITEM_COLORS = {
+    'QS': '#1f77b4', 'THE': '#ff7f0e', 'ARWU': '#2ca02c', 'Funding': '#1f77b4', 'Citation': '#ff7f0e',
+    'Tech_transfer': '#1f77b4', 'Patent_application': '#ff7f0e', 'Patent_registration': '#2ca02c',
+    'Internship_rate': '#9467bd', 'Total_students': '#1f77b4'
 }
+# 메트릭 스토어와 데이터셋 버전을 계산해 읽기 전용 스냅샷으로 등록합니다 (src/snapshot.py).
+# 이후 data/ 의 엑셀이 바뀌면 워커 재시작 없이 바뀐 파일만 다시 읽어 새 스냅샷으로 교체하므로,
+# global_data 는 시작 시점의 스냅샷입니다. 콜백은 page_registry.page_data() 로 현재 스냅샷을 받습니다.
+global_data = data_reload.publish(data_reload.attach_derived({'item_colors': ITEM_COLORS}))
+# gunicorn preload 모드에서는 첫 화면 페이지를 fork 전에 준비하고, 숫자형 데이터를 메모리 매핑으로 바꾸어
+# 워커들이 복사 없이 공유합니다. 다른 페이지의 데이터는 워커에서 처음 요청될 때 로드됩니다.
+if shared_data.ENABLED:
+    page_registry.preload([page_registry.DEFAULT_PAGE])
+    global_data = data_reload.publish(shared_data.share_frames(data_reload.current()))
 
 # 앱 레이아웃 설정
 app.layout = main_layout
 
 # 콜백 등록
 register_main_callbacks(app)
-register_summary_callbacks(app, global_data)
-# 평판도 페이지 콜백 등록 (임시)
-# register_reputation_callbacks(app, global_data)
+page_registry.register_callbacks(app)
+
+# 데이터 변경 감지 시작 (CUK_RELOAD_INTERVAL=0 이면 비활성화)
+# preload 모드의 마스터 프로세스에서는 시작하지 않고, gunicorn.conf.py 의 post_fork 에서 워커마다 시작합니다.
+if not shared_data.ENABLED:
+    data_reload.start_watcher()
 
 # App Engine을 위한 서버 변수 정의
 server = app.server
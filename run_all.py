@@ -5,63 +5,14 @@ import pandas as pd
 import plotly.graph_objs as go
 import re
 
-# 변경된 부분: 각 파일을 개별적으로 로드하여 오류를 처리합니다.
-# Try to load each XLSX file, fall back to temporary data if not found.
-try:
-    df_reputation = pd.read_excel('data/reputation.xlsx')
-except FileNotFoundError as e:
-    print(f"Error: {e}. Please ensure reputation.xlsx is in the 'data' directory. Using temporary data.")
-    # 업데이트된 임시 데이터 프레임, ARWU 추가
-    df_reputation = pd.DataFrame({
-        'Year': [2024, 2025, 2026],
-        'QS_Rank': [850, 800, 750],
-        'QS_Rank_Domestic': [15, 12, 10],
-        'THE_Rank': [900, 850, 800],
-        'THE_Rank_Domestic': [20, 18, 16],
-        'ARWU_Rank': [700, 650, 600],
-        'ARWU_Rank_Domestic': [10, 9, 8],
-        # 임시 데이터에 다른 평판도 관련 컬럼 추가 (사용자의 요청에 따라)
-        'QS_Overall': [16.53, 20.0, 30.8],
-        'QS_Academic_Reputation': [4.5, 5.0, 7.9],
-        'QS_Citations_Per_Faculty': [18.1, 25.0, 31.0],
-        'QS_Faculty_Student_Ratio': [85.0, 90.0, 97.4],
-        'QS_Employer_Reputation': [3.2, 4.0, 6.0]
-    })
+from src.data_reload import load_sources
 
-try:
-    df_research = pd.read_excel('data/research.xlsx')
-except FileNotFoundError as e:
-    print(f"Error: {e}. Please ensure research.xlsx is in the 'data' directory. Using temporary data.")
-    df_research = pd.DataFrame({
-        'Year': [2023, 2024, 2025],
-        'Funding': [100, 120, 150],
-        'Citation': [1500, 1650, 1800]
-    })
-
-try:
-    df_cooperation = pd.read_excel('data/cooperation.xlsx')
-except FileNotFoundError as e:
-    print(f"Error: {e}. Please ensure cooperation.xlsx is in the 'data' directory. Using temporary data.")
-    df_cooperation = pd.DataFrame({
-        'Year': [2023, 2024, 2025],
-        'Tech_transfer': [5, 8, 12],
-        'Patent_application': [50, 60, 70],
-        'Patent_registration': [30, 40, 50],
-        'Internship_rate': [0.15, 0.18, 0.22]
-    })
-
-try:
-    df_global = pd.read_excel('data/global.xlsx')
-except FileNotFoundError as e:
-    print(f"Error: {e}. Please ensure global.xlsx is in the 'data' directory. Using temporary data.")
-    df_global = pd.DataFrame({
-        'Year': [2023, 2024, 2025],
-        'Total_students': [500, 600, 750],
-        '중국': [200, 250, 300],
-        '베트남': [150, 180, 200],
-        '말레이시아': [100, 120, 150],
-        '기타': [50, 50, 100]
-    })
+# 네 개의 엑셀을 동시에 읽습니다. 파일이 없으면 src/data_reload.py 의 임시 데이터를 사용합니다.
+_frames = load_sources(['df_reputation', 'df_research', 'df_cooperation', 'df_global'])
+df_reputation = _frames['df_reputation']
+df_research = _frames['df_research']
+df_cooperation = _frames['df_cooperation']
+df_global = _frames['df_global']
 
 
 # 지표별/항목별 색상 팔레트 정의
@@ -0,0 +1,72 @@
+import functools
+import os
+import tempfile
+
+from src import data_reload
+
+# 백그라운드 콜백을 사용할지 여부. 0 이면 모든 콜백을 요청 스레드에서 바로 실행합니다.
+ENABLED = os.environ.get('CUK_BACKGROUND', '1') != '0'
+
+# 작업 상태와 결과를 저장하는 디스크 캐시 위치. 같은 인스턴스의 모든 워커 프로세스가 공유합니다.
+CACHE_DIR = os.environ.get('CUK_BACKGROUND_DIR', os.path.join(tempfile.gettempdir(), 'cuk_dash_background'))
+
+# 완료된 결과를 보관하는 시간(초). 같은 입력과 같은 데이터 버전의 요청은 이 시간 동안 다시 계산하지 않습니다.
+EXPIRE = int(os.environ.get('CUK_BACKGROUND_EXPIRE', '3600'))
+
+_manager = None
+
+
+def _data_version():
+    data = data_reload.current()
+    return data['data_version'] if data else None
+
+
+def manager():
+    """
+    디스크 캐시 기반 백그라운드 콜백 관리자(dash.DiskcacheManager)를 반환합니다.
+
+    작업은 워커와 별도의 프로세스에서 실행되어 요청 스레드를 막지 않고, 결과는 콜백 입력값과
+    데이터셋 버전을 키로 캐시됩니다. 비활성화되었거나 diskcache/multiprocess/psutil 이 설치되어
+    있지 않으면 None 입니다.
+    """
+    global _manager
+    if _manager is None and ENABLED:
+        try:
+            import diskcache
+            from dash import DiskcacheManager
+            _manager = DiskcacheManager(diskcache.Cache(CACHE_DIR), cache_by=[_data_version], expire=EXPIRE)
+        except ImportError as e:
+            print(f"Background callbacks disabled: {e}. Run 'pip install dash[diskcache]' to enable them.")
+            return None
+    return _manager
+
+
+def _no_progress(*args):
+    # 백그라운드 실행이 아닐 때 set_progress 대신 사용합니다.
+    return None
+
+
+def callback(app, *dependencies, progress=None, cancel=None, cache_args_to_ignore=None, **kwargs):
+    """
+    오래 걸리는 콜백을 백그라운드 작업으로 등록하는 데코레이터입니다. 나머지 인자는 app.callback 과 같습니다.
+
+    progress 를 주면 함수는 첫 인자로 set_progress 를 받아 진행 상황을 보고할 수 있고, cancel 입력이
+    바뀌면 실행 중인 작업이 중단됩니다. 결과는 입력값과 데이터셋 버전으로 캐시되며, 버튼 클릭 수처럼
+    결과와 무관한 입력은 cache_args_to_ignore(인자 위치 목록)로 키에서 뺍니다.
+    관리자를 사용할 수 없으면 같은 함수를 일반 콜백으로 등록하며, 이때 진행 상황 보고, 중단, 캐시는 동작하지 않습니다.
+    """
+    def decorator(func):
+        background_manager = manager()
+        if background_manager is not None:
+            return app.callback(
+                *dependencies, background=True, manager=background_manager, progress=progress,
+                cancel=cancel, cache_args_to_ignore=cache_args_to_ignore, **kwargs
+            )(func)
+        if progress is None:
+            return app.callback(*dependencies, **kwargs)(func)
+
+        @functools.wraps(func)
+        def run_now(*args):
+            return func(_no_progress, *args)
+        return app.callback(*dependencies, **kwargs)(run_now)
+    return decorator
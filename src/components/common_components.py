@@ -1,125 +1,207 @@
-from dash import html
+from dash import html, no_update
 import pandas as pd
-import re
 
-# 공통 컴포넌트: 순위 KPI 카드 생성
-def create_ranking_card(title, current_data, prev_data, suffix='', color='gray'):
-    try:
-        current_rank = current_data[f'{title.split(" ")[0]}_Rank']
-        prev_rank = prev_data[f'{title.split(" ")[0]}_Rank']
-        current_domestic_rank = current_data[f'{title.split(" ")[0]}_Rank_Domestic']
-        prev_domestic_rank = prev_data[f'{title.split(" ")[0]}_Rank_Domestic']
-    except (KeyError, TypeError):
-        current_rank = "N/A"
-        prev_rank = "N/A"
-        current_domestic_rank = "N/A"
-        prev_domestic_rank = "N/A"
-
-    rank_value = f"{current_rank}" if not pd.isna(current_rank) else "미공개"
-    rank_class = 'kpi-value global' if not pd.isna(current_rank) else 'kpi-value kpi-na'
-    domestic_rank_value = f"{current_domestic_rank}" if not pd.isna(current_domestic_rank) else "미공개"
-    domestic_rank_class = 'kpi-value' if not pd.isna(current_domestic_rank) else 'kpi-value kpi-na'
-    
-    def get_change_text(current, prev):
-        if pd.isna(current) or pd.isna(prev) or isinstance(current, str) or isinstance(prev, str):
-            return '', 'gray', 'N/A'
-        
-        try:
-            change = float(current) - float(prev)
-            if change < 0:
-                arrow = '▲'
-                arrow_color = '#dc3545'
-                change_text = f"{abs(change):.0f}"
-            elif change > 0:
-                arrow = '▼'
-                arrow_color = '#007bff'
-                change_text = f"{abs(change):.0f}"
-            else:
-                arrow = ''
-                arrow_color = 'gray'
-                change_text = "0"
-            return arrow, arrow_color, change_text
-        except (ValueError, TypeError):
-            return '', 'gray', 'N/A'
-
-    arrow_int, arrow_color_int, change_text_int = get_change_text(current_rank, prev_rank)
-    arrow_dom, arrow_color_dom, change_text_dom = get_change_text(current_domestic_rank, prev_domestic_rank)
-    
+# 증감 색상 클래스. change 는 로딩 시 계산된 증감 값(delta_table)이며, 없으면 NaN 입니다.
+# 화살표(▲/▼)는 이 클래스로 style.css 에서 그리므로 값으로 보내지 않습니다.
+# 순위는 숫자가 작아질수록 상승이므로 reverse=True 로 화살표 방향을 뒤집습니다.
+def _change_class(change, reverse=False):
+    if pd.isna(change) or change == 0:
+        return 'kpi-change'
+    up = (change < 0) if reverse else (change > 0)
+    return 'kpi-change up' if up else 'kpi-change down'
+
+# 기준 년도 대비 증감률과 2년 이상이면 연평균 성장률(CAGR)을 한 줄로 만듭니다. 계산할 수 없으면 빈 문자열입니다.
+def _growth_text(comparison, column):
+    pct = comparison.pct(column)
+    if pd.isna(pct):
+        return ''
+    text = f"{comparison.base_year}년 대비 {pct:+.1%}"
+    cagr = comparison.cagr(column)
+    if comparison.periods > 1 and not pd.isna(cagr):
+        text += f" · 연평균 {cagr:+.1%}"
+    return text
+
+# 비교 순위표 요약(peer_benchmark.get())을 카드 하단의 짧은 문구 목록으로 만듭니다.
+# peer_names 를 주면 그 대학 순서대로 한 줄씩 만들며, 값이 없는 줄은 빈 문자열입니다.
+def _peer_lines(peer, peer_names=None):
+    if peer_names is None:
+        if not peer:
+            return []
+        peer_names = list(peer['gaps'])
+    lines = [f"상위 {peer['top_percent']:.1f}% ({peer['ranked']}개 대학 중)" if peer else '']
+    for name in peer_names:
+        gap = peer['gaps'].get(name) if peer else None
+        if gap is None:
+            text = ''
+        elif gap < 0:
+            text = f"{name} 대비 {abs(gap):.0f}위 앞"
+        elif gap > 0:
+            text = f"{name} 대비 {gap:.0f}위 뒤"
+        else:
+            text = f"{name} 대비 동일"
+        lines.append(text)
+    return lines
+
+# 카드에서 년도에 따라 바뀌는 값의 위치: (노드 이름, 속성 이름)
+# 값이 놓인 노드는 카드 id 에 노드 이름을 붙인 고정 id(card_node_id)를 가지므로, 콜백이 카드 구조와 무관하게 출력으로 바로 바꿉니다.
+CARD_FIELDS = {
+    # 순위 카드
+    'rank': ('rank', 'children'),
+    'rank_class': ('rank', 'className'),
+    'change_class_int': ('change-int', 'className'),
+    'change_text_int': ('change-text-int', 'children'),
+    'domestic_rank': ('domestic-rank', 'children'),
+    'domestic_rank_class': ('domestic-rank', 'className'),
+    'change_class_dom': ('change-dom', 'className'),
+    'change_text_dom': ('change-text-dom', 'children'),
+    'peers': ('peers', 'children'),
+    # 일반 KPI 카드
+    'value': ('value', 'children'),
+    'value_class': ('value', 'className'),
+    'change_class': ('change', 'className'),
+    'change_text': ('change-text', 'children'),
+    'growth': ('growth', 'children'),
+}
+# ranking_card_state()/kpi_card_state() 가 반환하는 값의 이름 (순서 포함)
+RANKING_CARD_FIELDS = (
+    'rank', 'rank_class', 'change_class_int', 'change_text_int',
+    'domestic_rank', 'domestic_rank_class', 'change_class_dom', 'change_text_dom', 'peers',
+)
+KPI_CARD_FIELDS = ('value', 'value_class', 'change_class', 'change_text', 'growth')
+
+def card_node_id(card_id, node):
+    return f'{card_id}-{node}'
+
+def _id(card_id, node):
+    # card_id 가 없으면(요약 페이지 밖의 카드) id 를 붙이지 않습니다.
+    return {} if card_id is None else {'id': card_node_id(card_id, node)}
+
+# 공통 컴포넌트: 순위 KPI 카드에 표시할 값
+# 증감은 comparison(delta_table.compare())에 미리 계산된 중간값(_Mid) 순위 차이를 읽습니다.
+def ranking_card_state(title, current_data, comparison, peer=None, peer_names=None):
+    prefix = title.split(" ")[0]
+    current_rank = current_data.get(f'{prefix}_Rank', "N/A")
+    current_domestic_rank = current_data.get(f'{prefix}_Rank_Domestic', "N/A")
+
+    change_int = comparison.delta(f'{prefix}_Rank_Mid')
+    change_dom = comparison.delta(f'{prefix}_Rank_Domestic_Mid')
+    change_class_int = _change_class(change_int, reverse=True)
+    change_class_dom = _change_class(change_dom, reverse=True)
+    change_text_int = f"{abs(change_int):.0f}" if not pd.isna(change_int) else 'N/A'
+    change_text_dom = f"{abs(change_dom):.0f}" if not pd.isna(change_dom) else 'N/A'
+
     if pd.isna(current_rank):
-        arrow_int, change_text_int = '', ''
+        change_class_int, change_text_int = 'kpi-change', ''
     if pd.isna(current_domestic_rank):
-        arrow_dom, change_text_dom = '', ''
+        change_class_dom, change_text_dom = 'kpi-change', ''
+
+    return {
+        'rank': f"{current_rank}" if not pd.isna(current_rank) else "미공개",
+        'rank_class': 'kpi-value global' if not pd.isna(current_rank) else 'kpi-value kpi-na',
+        'change_class_int': change_class_int,
+        'change_text_int': f" {change_text_int}",
+        'domestic_rank': f"{current_domestic_rank}" if not pd.isna(current_domestic_rank) else "미공개",
+        'domestic_rank_class': 'kpi-value' if not pd.isna(current_domestic_rank) else 'kpi-value kpi-na',
+        'change_class_dom': change_class_dom,
+        'change_text_dom': f" {change_text_dom}",
+        # 비교 문구는 한 줄씩 나눠 표시하며(white-space: pre-line), 값이 없는 줄은 뺍니다.
+        'peers': '\n'.join(line for line in _peer_lines(peer, peer_names) if line),
+    }
 
+# 공통 컴포넌트: 순위 KPI 카드 생성
+# peer 를 주면 여러 대학 중 상대 위치와 비교 대학과의 격차를 함께 표시합니다.
+# peer_names(비교 대학 목록)를 주면 비교 문구가 그 대학 순서로 표시됩니다.
+def create_ranking_card(title, current_data, comparison, suffix='', color='gray', peer=None, peer_names=None):
+    return build_ranking_card(title, ranking_card_state(title, current_data, comparison, peer, peer_names), color)
+
+# ranking_card_state() 로 계산한 값으로 순위 KPI 카드를 만듭니다.
+# card_id 를 주면 값이 바뀌는 노드에 고정 id(CARD_FIELDS)를 붙입니다.
+def build_ranking_card(title, state, color='gray', card_id=None):
+    # 카드 색상은 CSS 변수(--item-color)로 한 번만 지정하고, 값 글자색은 style.css 에서 적용합니다.
     return html.Div([
         html.H4(title, className='kpi-title'),
         html.Div(className='kpi-value-container', children=[
             html.Div(className='ranking-item', children=[
                 html.P("국제", className='ranking-label'),
-                html.P(rank_value, className=rank_class, style={'color': color, 'margin': '0'}),
-                html.Div(className='kpi-change', children=[
-                    html.Span(arrow_int, style={'color': arrow_color_int}),
-                    html.Span(f" {change_text_int}", style={'color': arrow_color_int})
+                html.P(state['rank'], className=state['rank_class'], **_id(card_id, 'rank')),
+                html.Div(className=state['change_class_int'], **_id(card_id, 'change-int'), children=[
+                    html.Span(state['change_text_int'], **_id(card_id, 'change-text-int'))
                 ])
             ]),
             html.Div(className='ranking-item', children=[
                 html.P("국내", className='ranking-label'),
-                html.P(domestic_rank_value, className=domestic_rank_class, style={'color': color, 'margin': '0'}),
-                html.Div(className='kpi-change', children=[
-                    html.Span(arrow_dom, style={'color': arrow_color_dom}),
-                    html.Span(f" {change_text_dom}", style={'color': arrow_color_dom})
+                html.P(state['domestic_rank'], className=state['domestic_rank_class'], **_id(card_id, 'domestic-rank')),
+                html.Div(className=state['change_class_dom'], **_id(card_id, 'change-dom'), children=[
+                    html.Span(state['change_text_dom'], **_id(card_id, 'change-text-dom'))
                 ])
             ])
-        ])
-    ], className='kpi-card')
+        ]),
+        html.P(state['peers'], className='kpi-peer', **_id(card_id, 'peers'))
+    ], className='kpi-card', style={'--item-color': color})
 
-# 공통 컴포넌트: 일반 KPI 카드 생성
-def create_kpi_card(title, value, prev_value, suffix='', color='gray'):
+# 공통 컴포넌트: 일반 KPI 카드에 표시할 값
+# 값과 증감은 comparison(delta_table.compare())에서 column 으로 읽습니다.
+# 증감률 문구(growth)는 % 지표이거나 표시할 값이 없으면 빈 문자열입니다.
+def kpi_card_state(title, comparison, column, suffix=''):
+    value = comparison.value(column)
+    growth = ''
     if pd.isna(value):
         display_value = '미공개'
         value_class = 'kpi-value kpi-na'
         change_text = ''
-        arrow = ''
-        arrow_color = 'gray'
+        change_class = 'kpi-change'
     else:
-        try:
-            current_val = float(value)
-            prev_val = float(prev_value)
-        except (ValueError, TypeError):
-            current_val = 0
-            prev_val = 0
-
-        change = current_val - prev_val
-        
-        arrow = ''
-        arrow_color = 'gray'
-        change_text = ""
-        
-        if change > 0:
-            arrow = '▲'
-            arrow_color = '#dc3545'
-        elif change < 0:
-            arrow = '▼'
-            arrow_color = '#007bff'
-        
+        change = comparison.delta(column)
+        change_class = _change_class(change)
+
         if suffix == '%':
             change_text = f"{change * 100:.0f}"
-            display_value = f"{current_val:.0%}"
+            display_value = f"{value:.0%}"
         elif suffix == '억원':
             change_text = f"{change:.0f}"
-            display_value = f"{current_val:.0f}{suffix}"
+            display_value = f"{value:.0f}{suffix}"
+            growth = _growth_text(comparison, column)
         else:
             change_text = f"{change:.0f}"
-            display_value = f"{current_val:.0f}"
-        
+            display_value = f"{value:.0f}"
+            growth = _growth_text(comparison, column)
+        # 기준 년도 값이 없으면 증감을 표시하지 않습니다.
+        if pd.isna(change):
+            change_text = 'N/A'
+
         value_class = 'kpi-value'
 
+    return {
+        'value': display_value,
+        'value_class': value_class,
+        'change_class': change_class,
+        'change_text': f" {change_text}{'%' if suffix == '%' and '순위' not in title and change_text != 'N/A' else ''}",
+        'growth': growth,
+    }
+
+# 공통 컴포넌트: 일반 KPI 카드 생성
+def create_kpi_card(title, comparison, column, suffix='', color='gray'):
+    return build_kpi_card(title, kpi_card_state(title, comparison, column, suffix), color)
+
+# kpi_card_state() 로 계산한 값으로 일반 KPI 카드를 만듭니다.
+# card_id 를 주면 값이 바뀌는 노드에 고정 id(CARD_FIELDS)를 붙입니다.
+def build_kpi_card(title, state, color='gray', card_id=None):
     return html.Div([
         html.H4(title, className='kpi-title'),
         html.Div(className='kpi-value-container', children=[
-            html.P(display_value, className=value_class, style={'color': color}),
-            html.Div(className='kpi-change', children=[
-                html.Span(arrow, style={'color': arrow_color}),
-                html.Span(f" {change_text}{'%' if suffix == '%' and '순위' not in title else ''}", style={'color': arrow_color})
+            html.P(state['value'], className=state['value_class'], **_id(card_id, 'value')),
+            html.Div(className=state['change_class'], **_id(card_id, 'change'), children=[
+                html.Span(state['change_text'], **_id(card_id, 'change-text'))
             ])
-        ])
-    ], className='kpi-card')
+        ]),
+        html.P(state['growth'], className='kpi-growth', **_id(card_id, 'growth'))
+    ], className='kpi-card', style={'--item-color': color})
+
+# 공통 컴포넌트: 카드 값 출력
+# card_id 카드에서 fields(RANKING_CARD_FIELDS/KPI_CARD_FIELDS) 값이 놓인 (노드 id, 속성) 목록입니다. 콜백 출력으로 등록합니다.
+def card_outputs(card_id, fields):
+    return [(card_node_id(card_id, CARD_FIELDS[name][0]), CARD_FIELDS[name][1]) for name in fields]
+
+# card_outputs() 와 같은 순서로 state 의 값을 반환합니다. previous 와 같은 값은 no_update 로 두어 응답에서 뺍니다.
+def card_updates(fields, state, previous=None):
+    return [state[name] if previous is None or previous[name] != state[name] else no_update for name in fields]
@@ -0,0 +1,130 @@
+import os
+
+from src.data_handler import columns_of
+
+# 국가별 유학생 수 long format 컬럼. 한 행이 (년도, 국가) 하나입니다.
+# data/global.xlsx 는 국가별 컬럼(wide) 또는 이 컬럼들(long) 어느 형식이어도 됩니다.
+COUNTRY_COLUMNS = ('Year', 'Country', 'Students')
+
+# 상위 국가 외의 나머지를 합쳐 표시하는 이름. 엑셀의 '기타' 컬럼/행도 여기에 더해집니다.
+OTHER = '기타'
+# 그래프에 따로 표시할 상위 국가 수. 나머지는 OTHER 하나로 합칩니다.
+TOP_COUNTRIES = int(os.environ.get('CUK_TOP_COUNTRIES', '5'))
+
+# 국가 색상. 전체 기간 유학생 수 순서대로 배정하며, OTHER 는 항상 회색입니다.
+PALETTE = ('#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b', '#e377c2', '#bcbd22', '#17becf')
+OTHER_COLOR = '#7f7f7f'
+
+# split_countries() 후 df_global 에 남는 컬럼
+TOTAL_COLUMNS = {'Year', 'Date', 'Total_students'}
+
+
+def split_countries(df):
+    """
+    df_global 을 년도별 합계 표와 국가별 유학생 수 long format 표로 나눕니다.
+
+    합계 표는 국가 컬럼을 뺀 나머지(Year, Date, Total_students)이며, Total_students 가 없으면 국가별 합으로 채웁니다.
+    long format 표는 (Year[, Date], Country, Students) 이고 값이 없는 국가는 행을 만들지 않습니다.
+    """
+    time_columns = [column for column in ('Year', 'Date') if column in df.columns]
+    if 'Country' in df.columns:
+        long = df.loc[:, time_columns + ['Country', 'Students']]
+        totals = long.groupby(time_columns, as_index=False, observed=True)['Students'].sum()
+        totals = totals.rename(columns={'Students': 'Total_students'})
+    else:
+        countries = [column for column in columns_of('df_global', df, 'metric') if column != 'Total_students']
+        long = df.melt(id_vars=time_columns, value_vars=countries, var_name='Country', value_name='Students')
+        totals = df.drop(columns=countries)
+        if 'Total_students' not in totals.columns:
+            totals['Total_students'] = df[countries].sum(axis=1).astype('float32')
+    long = long.dropna(subset=['Year', 'Students'])
+    long = long.assign(Year=long['Year'].astype('int64'), Country=long['Country'].astype(str).astype('category'))
+    return totals, long.reset_index(drop=True)
+
+
+class CountryMix:
+    """
+    국가별 유학생 수를 상위 국가 + 기타로 묶어 년도별로 미리 계산해 두고 콜백에서 바로 조회하는 객체입니다.
+
+        mix = data['country_mix']
+        mix.year(2025)    # {'countries': ['중국', ..., '기타'], 'students': [...], 'colors': [...]}
+        mix.trend()       # 시간 x (상위 국가 + 기타) 표
+        mix.color('중국')
+
+    국가 수와 관계없이 그래프의 막대/선은 상위 국가 수 + 1 개입니다.
+    """
+    __slots__ = ('table', 'top', 'order', 'colors', '_years', '_trend')
+
+    def __init__(self, table, top=TOP_COUNTRIES):
+        self.table = table
+        self.top = top
+        # 같은 년도에 여러 시점(Date)이 있으면 다른 도메인과 같이 년도의 첫 행을 그 년도 값으로 사용합니다.
+        by_year = table.drop_duplicates(['Year', 'Country'])
+        named = by_year[by_year['Country'] != OTHER]
+
+        # 전체 기간 합계 순서: 색상 배정과 추이 그래프의 상위 국가 기준
+        totals = named.groupby('Country', observed=True)['Students'].sum().sort_values(ascending=False, kind='stable')
+        self.order = [str(country) for country in totals.index]
+        self.colors = {country: PALETTE[i % len(PALETTE)] for i, country in enumerate(self.order)}
+        self.colors[OTHER] = OTHER_COLOR
+
+        # 년도별 상위 국가: 모든 년도를 한 번의 groupby/rank 로 계산하고, 나머지(엑셀의 기타 포함)는 OTHER 로 이름을 바꿔 합칩니다.
+        rank = by_year['Students'].where(by_year['Country'] != OTHER).groupby(by_year['Year']).rank(method='first', ascending=False)
+        label = by_year['Country'].astype(str).where(rank <= top, OTHER)
+        rolled = by_year.assign(Country=label).groupby(['Year', 'Country'], as_index=False)['Students'].sum()
+        # 년도 안에서는 많은 순서, OTHER 는 항상 마지막
+        rolled = rolled.assign(_other=rolled['Country'] == OTHER).sort_values(
+            ['Year', '_other', 'Students'], ascending=[True, True, False], kind='stable'
+        )
+        self._years = {}
+        for year, rows in rolled.groupby('Year', sort=False):
+            countries = rows['Country'].tolist()
+            self._years[int(year)] = {
+                'countries': countries,
+                'students': rows['Students'].astype('float64').tolist(),
+                'colors': [self.color(country) for country in countries],
+            }
+        self._trend = None
+
+    def color(self, country):
+        return self.colors.get(country, OTHER_COLOR)
+
+    def years(self):
+        return sorted(self._years)
+
+    def year(self, year):
+        """
+        해당 년도의 상위 국가 + 기타 목록(국가, 유학생 수, 색상)을 반환합니다. 없는 년도는 빈 목록입니다.
+        """
+        if year is not None and int(year) in self._years:
+            return self._years[int(year)]
+        return {'countries': [], 'students': [], 'colors': []}
+
+    def trend(self):
+        """
+        전체 기간 상위 국가 + 기타의 시간별 유학생 수 표를 반환합니다. 처음 요청될 때 한 번만 계산합니다.
+        인덱스는 Date 컬럼이 있으면 날짜, 없으면 년도입니다.
+        """
+        if self._trend is None:
+            time_column = 'Date' if 'Date' in self.table.columns else 'Year'
+            top = self.order[:self.top]
+            country = self.table['Country'].astype(str)
+            label = country.where(country.isin(top), OTHER)
+            trend = self.table.assign(Country=label).pivot_table(
+                index=time_column, columns='Country', values='Students', aggfunc='sum', observed=True
+            )
+            self._trend = trend.reindex(columns=[column for column in top + [OTHER] if column in trend.columns])
+        return self._trend
+
+
+def build_country_mix(data):
+    """
+    data['df_global'] 을 년도별 합계 표로 바꾸고, 국가별 유학생 수로 CountryMix 를 만들어 data['country_mix'] 에 넣습니다.
+    df_global 이 없거나 이미 합계 표로 바뀌어 있으면(다른 데이터만 다시 읽은 경우) 그대로 둡니다.
+    """
+    df = data.get('df_global')
+    if df is None or ('country_mix' in data and set(df.columns) <= TOTAL_COLUMNS):
+        return data
+    data['df_global'], long = split_countries(df)
+    data['country_mix'] = CountryMix(long)
+    return data
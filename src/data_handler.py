@@ -0,0 +1,450 @@
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+import numpy as np
+import pandas as pd
+
+# 엑셀 원본을 컬럼 단위(.npz)로 변환해 둔 스냅샷 저장 위치
+# App Engine처럼 data/ 가 읽기 전용인 환경에서는 임시 디렉터리를 사용합니다.
+SNAPSHOT_DIR = os.environ.get('CUK_SNAPSHOT_DIR', os.path.join('data', '.snapshots'))
+FALLBACK_SNAPSHOT_DIR = os.path.join(tempfile.gettempdir(), 'cuk_dash_snapshots')
+MANIFEST_NAME = 'manifest.json'
+
+# 엑셀 파싱 엔진: auto(기본값) | calamine | openpyxl
+# auto 는 python-calamine 이 설치되어 있으면 calamine(Rust 구현, openpyxl 보다 수 배 빠름)을, 아니면 openpyxl 을 사용합니다.
+EXCEL_ENGINE = os.environ.get('CUK_EXCEL_ENGINE', 'auto')
+_auto_engine = None
+
+
+def _file_sha256(path):
+    """
+    원본 파일의 내용 해시(sha256)를 계산합니다.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _snapshot_dirs():
+    """
+    스냅샷을 찾을 디렉터리 목록을 우선순위대로 반환합니다.
+    """
+    return [SNAPSHOT_DIR, FALLBACK_SNAPSHOT_DIR]
+
+
+def _read_manifest(snapshot_dir):
+    try:
+        with open(os.path.join(snapshot_dir, MANIFEST_NAME), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _atomic_write(path, write):
+    """
+    임시 파일에 쓴 뒤 os.replace 로 교체하여, 여러 워커가 동시에 써도 깨진 파일이 보이지 않게 합니다.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+@contextmanager
+def _manifest_lock(snapshot_dir, name=MANIFEST_NAME):
+    """
+    manifest(또는 같은 디렉터리의 name 파일)를 읽고 고쳐 쓰는 동안 다른 프로세스/스레드가 같은 파일을 고치지 못하게 잠급니다.
+    여러 엑셀을 동시에 파싱해도 서로의 항목을 덮어쓰지 않습니다. fcntl 이 없는 환경에서는 잠그지 않습니다.
+    """
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(snapshot_dir, exist_ok=True)
+    with open(os.path.join(snapshot_dir, name + '.lock'), 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _write_manifest(snapshot_dir, manifest):
+    payload = json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8')
+    _atomic_write(os.path.join(snapshot_dir, MANIFEST_NAME), lambda f: f.write(payload))
+
+
+def _write_snapshot(df, path):
+    """
+    DataFrame을 컬럼별 배열로 나누어 .npz 스냅샷으로 저장합니다.
+    컬럼명과 dtype은 JSON 메타데이터로 함께 저장하여 복원 시 그대로 되살립니다.
+    """
+    meta = {'columns': list(df.columns), 'dtypes': [str(dtype) for dtype in df.dtypes]}
+    arrays = {f'c{i}': df.iloc[:, i].to_numpy() for i in range(df.shape[1])}
+    arrays['__meta__'] = np.array(json.dumps(meta, ensure_ascii=False))
+    _atomic_write(path, lambda f: np.savez(f, **arrays))
+
+
+def _read_snapshot(path, keep=None):
+    """
+    .npz 스냅샷에서 DataFrame을 복원합니다. keep(컬럼명) 이 False 인 컬럼은 배열을 읽지 않습니다.
+    문자열/혼합형 컬럼은 object 배열로 저장되므로 allow_pickle 이 필요하며,
+    이 파일들은 이 모듈이 직접 생성한 로컬 캐시만 읽습니다.
+    """
+    with np.load(path, allow_pickle=True) as npz:
+        meta = json.loads(str(npz['__meta__']))
+        data, columns = {}, []
+        for i, (column, dtype) in enumerate(zip(meta['columns'], meta['dtypes'])):
+            if keep is not None and not keep(column):
+                continue
+            values = npz[f'c{i}']
+            data[i] = values if dtype == 'object' else pd.Series(values).astype(dtype)
+            columns.append(column)
+    df = pd.DataFrame(data)
+    df.columns = columns
+    return df
+
+
+def _snapshot_name(key, sha256):
+    stem = os.path.splitext(os.path.basename(key.split('?')[0]))[0]
+    digest = hashlib.sha256(f'{key}:{sha256}'.encode('utf-8')).hexdigest()
+    return f'{stem}-{digest[:16]}.npz'
+
+
+def excel_engine():
+    """
+    CUK_EXCEL_ENGINE 에 따라 사용할 pandas 엑셀 엔진 이름을 반환합니다.
+    """
+    global _auto_engine
+    if EXCEL_ENGINE != 'auto':
+        return EXCEL_ENGINE
+    if _auto_engine is None:
+        try:
+            import python_calamine  # noqa: F401
+            _auto_engine = 'calamine'
+        except ImportError:
+            _auto_engine = 'openpyxl'
+    return _auto_engine
+
+
+def read_workbook(path, **kwargs):
+    """
+    선택된 엔진으로 엑셀을 읽습니다. engine 을 직접 주면 그 엔진을 사용합니다.
+    openpyxl 은 셀 객체를 모두 메모리에 올리지 않도록 read-only(행 단위 스트리밍) 모드로 엽니다.
+    """
+    kwargs.setdefault('engine', excel_engine())
+    if kwargs['engine'] == 'openpyxl':
+        kwargs.setdefault('engine_kwargs', {'read_only': True, 'data_only': True, 'keep_links': False})
+    return pd.read_excel(path, **kwargs)
+
+
+def read_excel_cached(path, keep=None, **kwargs):
+    """
+    pd.read_excel 과 같은 결과를 반환하되, 한 번 파싱한 결과를 컬럼 스냅샷으로 저장해 재사용합니다.
+    keep(컬럼명) 을 주면 True 인 컬럼만 반환합니다(usecols 와 같은 역할). 스냅샷에는 모든 컬럼이 저장되므로
+    keep 이 달라도 같은 스냅샷을 사용하며, 스냅샷에서 읽을 때는 필요한 컬럼의 배열만 읽습니다.
+
+    - 원본의 mtime/크기가 manifest 와 같으면 해시 계산 없이 바로 스냅샷을 읽습니다.
+    - mtime이 달라졌으면 내용 해시(sha256)를 계산해, 같은 내용의 스냅샷이 있으면 재사용합니다.
+    - 스냅샷이 없으면 엑셀을 파싱(read_workbook)하고 스냅샷을 새로 기록합니다.
+    원본이 없으면 pd.read_excel 과 마찬가지로 FileNotFoundError 가 발생합니다.
+    """
+    stat = os.stat(path)
+    # 배포 환경마다 절대 경로가 달라지므로 앱 루트 기준 상대 경로를 키로 사용합니다.
+    key = os.path.normpath(path)
+    if kwargs:
+        # 읽기 옵션이 다르면 결과도 달라지므로 옵션까지 키에 포함합니다.
+        key = f'{key}?{json.dumps(kwargs, sort_keys=True, default=str)}'
+
+    sha256 = None
+    for snapshot_dir in _snapshot_dirs():
+        entry = _read_manifest(snapshot_dir).get(key)
+        if not entry:
+            continue
+        snapshot_path = os.path.join(snapshot_dir, entry['snapshot'])
+        if entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size and os.path.exists(snapshot_path):
+            try:
+                return _read_snapshot(snapshot_path, keep)
+            except (OSError, ValueError, KeyError):
+                break
+        # mtime만 바뀌고 내용은 그대로인 경우(복사/재배포 등) 해시로 확인합니다.
+        if sha256 is None:
+            sha256 = _file_sha256(path)
+        if entry['sha256'] == sha256 and os.path.exists(snapshot_path):
+            try:
+                df = _read_snapshot(snapshot_path, keep)
+            except (OSError, ValueError, KeyError):
+                break
+            _save_entry(snapshot_dir, key, stat, sha256, entry['snapshot'])
+            return df
+
+    df = read_workbook(path, **kwargs)
+    if sha256 is None:
+        sha256 = _file_sha256(path)
+    store_snapshot(path, df, stat=stat, sha256=sha256, key=key)
+    if keep is not None:
+        df = df.loc[:, [column for column in df.columns if keep(column)]]
+    return df
+
+
+def _save_entry(snapshot_dir, key, stat, sha256, snapshot_name):
+    with _manifest_lock(snapshot_dir):
+        manifest = _read_manifest(snapshot_dir)
+        previous = manifest.get(key, {}).get('snapshot')
+        manifest[key] = {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': sha256,
+            'snapshot': snapshot_name,
+        }
+        _write_manifest(snapshot_dir, manifest)
+    # 더 이상 어떤 항목도 참조하지 않는 이전 스냅샷은 정리합니다.
+    if previous and previous != snapshot_name and all(e['snapshot'] != previous for e in manifest.values()):
+        try:
+            os.remove(os.path.join(snapshot_dir, previous))
+        except OSError:
+            pass
+
+
+def store_snapshot(path, df, stat=None, sha256=None, key=None):
+    """
+    파싱된 DataFrame을 원본 파일의 스냅샷으로 기록합니다.
+    쓰기 가능한 첫 번째 디렉터리에 저장하며, 모두 실패하면 경고만 출력하고 넘어갑니다.
+    """
+    stat = stat or os.stat(path)
+    sha256 = sha256 or _file_sha256(path)
+    key = key or os.path.normpath(path)
+    snapshot_name = _snapshot_name(key, sha256)
+    for snapshot_dir in _snapshot_dirs():
+        try:
+            _write_snapshot(df, os.path.join(snapshot_dir, snapshot_name))
+            _save_entry(snapshot_dir, key, stat, sha256, snapshot_name)
+            return os.path.join(snapshot_dir, snapshot_name)
+        except OSError as e:
+            print(f"Warning: could not write snapshot to {snapshot_dir}: {e}")
+    return None
+
+
+# '801-850', '23-26', '1001+', 494 같은 순위 값에서 하한/상한 숫자를 추출하는 패턴
+RANK_RANGE_PATTERN = r'^\s*(\d+(?:\.\d+)?)(?:\s*[-~]\s*(\d+(?:\.\d+)?))?'
+# 순위 컬럼마다 추가되는 숫자형 파생 컬럼의 접미사
+RANK_BOUND_SUFFIXES = ('_Low', '_High', '_Mid')
+
+
+def is_rank_column(column):
+    """
+    국제/국내 순위 컬럼(*_Rank, *_Rank_Domestic)인지 확인합니다.
+    """
+    return isinstance(column, str) and (column.endswith('_Rank') or column.endswith('_Rank_Domestic'))
+
+
+def rank_bounds(values):
+    """
+    순위 Series 를 숫자형 (하한, 상한) Series 로 변환합니다. 범위가 아닌 값은 하한=상한=값입니다.
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        low = values.astype('float64')
+        return low, low
+    bounds = values.astype('string').str.extract(RANK_RANGE_PATTERN)
+    low = pd.to_numeric(bounds[0], errors='coerce').astype('float64')
+    high = pd.to_numeric(bounds[1], errors='coerce').astype('float64').fillna(low)
+    return low, high
+
+
+def normalize_rank_columns(df):
+    """
+    모든 순위 컬럼에 숫자형 하한(<컬럼>_Low), 상한(<컬럼>_High), 중간값(<컬럼>_Mid) 컬럼을 추가한 DataFrame을 반환합니다.
+
+    '801-850' 같은 범위 문자열과 숫자 순위를 벡터화된 문자열 추출로 한 번에 변환하며,
+    범위가 아닌 값은 하한=상한=값이 됩니다. 이미 파생 컬럼이 있으면 다시 계산해 덮어씁니다.
+    """
+    derived = {}
+    for column in df.columns:
+        if not is_rank_column(column):
+            continue
+        low, high = rank_bounds(df[column])
+        derived[f'{column}_Low'] = low
+        derived[f'{column}_High'] = high
+        derived[f'{column}_Mid'] = (low + high) / 2
+    return df.assign(**derived) if derived else df
+
+
+def dataset_version(frames):
+    """
+    DataFrame 묶음({이름: DataFrame})의 내용으로 데이터셋 버전(짧은 해시)을 계산합니다.
+    데이터가 같으면 워커/재시작과 관계없이 항상 같은 버전이 나옵니다.
+    """
+    digest = hashlib.sha256()
+    for name in sorted(frames):
+        df = frames[name]
+        digest.update(name.encode('utf-8'))
+        digest.update(json.dumps([str(column) for column in df.columns], ensure_ascii=False).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:12]
+
+
+# 도메인별 스키마 (global_data 키 -> 컬럼 선언)
+# columns 는 {컬럼: 종류}, extra 는 선언되지 않은 숫자 컬럼의 종류입니다. extra 가 None 이면 선언된 컬럼만 남깁니다.
+# 숫자가 아닌 미선언 컬럼(비고 등)은 버립니다. 단, extra 가 있으면 미선언 순위 컬럼(GRAS_PPS_Rank 등, is_rank_column)은
+# '301-400' 같은 범위 문자열이어도 rank 로 남깁니다.
+#   year     : 년도. 빈 값이 없으면 int16, 있으면 float32
+#   date     : 날짜 (datetime64)
+#   metric   : 지표 값 (float32)
+#   rank     : 순위. 숫자면 가장 작은 정수형(빈 값이 있으면 float32), '801-850' 같은 범위 문자열이면 category
+#   category : 반복되는 문자열 (category)
+SCHEMAS = {
+    'df_reputation': {
+        'columns': {
+            'Year': 'year', 'Date': 'date',
+            'QS_Rank': 'rank', 'QS_Rank_Domestic': 'rank',
+            'THE_Rank': 'rank', 'THE_Rank_Domestic': 'rank',
+            'ARWU_Rank': 'rank', 'ARWU_Rank_Domestic': 'rank',
+        },
+        # QS_Overall, QS_Academic_Reputation 등 평가기관별 세부 지표
+        'extra': 'metric',
+    },
+    'df_research': {
+        'columns': {'Year': 'year', 'Date': 'date', 'Funding': 'metric', 'Citation': 'metric'},
+        'extra': None,
+    },
+    'df_cooperation': {
+        'columns': {
+            'Year': 'year', 'Date': 'date', 'Tech_transfer': 'metric', 'Patent_application': 'metric',
+            'Patent_registration': 'metric', 'Internship_rate': 'metric',
+        },
+        'extra': None,
+    },
+    'df_global': {
+        # Country/Students 는 long format 엑셀(한 행이 년도, 국가 하나)의 컬럼입니다 (src/country_mix.py 참고).
+        'columns': {'Year': 'year', 'Date': 'date', 'Total_students': 'metric', 'Country': 'category', 'Students': 'metric'},
+        # wide format 엑셀의 국가별 유학생 수 (중국, 베트남, ...)
+        'extra': 'metric',
+    },
+    'df_peers': {
+        'columns': {'Year': 'year', 'Institution': 'category', 'Country': 'category', 'Ranking': 'category', 'Rank': 'rank'},
+        'extra': None,
+    },
+}
+
+
+def schema_columns(key):
+    """
+    스키마가 닫혀 있으면(extra 가 None) 읽을 컬럼만 True 인 함수를, 아니면 None 을 반환합니다.
+    read_excel_cached(keep=...) 에 넘겨 필요한 컬럼만 읽는 데 사용합니다.
+    """
+    schema = SCHEMAS.get(key)
+    if schema is None or schema['extra'] is not None:
+        return None
+    return schema['columns'].__contains__
+
+
+def _coerce(values, kind):
+    if kind == 'date':
+        return pd.to_datetime(values, errors='coerce')
+    if kind == 'category':
+        return values.astype('category')
+    if kind == 'rank' and not pd.api.types.is_numeric_dtype(values):
+        numbers = pd.to_numeric(values, errors='coerce')
+        # 범위 문자열이 섞여 있으면 원래 값을 그대로 category 로 둡니다.
+        if numbers.isna().sum() > values.isna().sum():
+            return values.astype('category')
+        values = numbers
+    numbers = pd.to_numeric(values, errors='coerce')
+    # 지표는 그래프에서 곱셈 등 연산을 하므로 정수형으로 줄이지 않습니다(int8 오버플로 방지).
+    if kind == 'metric':
+        return numbers.astype('float32')
+    # 년도, 숫자 순위: 정수이고 빈 값이 없으면 가장 작은 정수형으로 줄입니다.
+    if numbers.notna().all() and (numbers % 1 == 0).all():
+        return pd.to_numeric(numbers.astype('int64'), downcast='integer')
+    return numbers.astype('float32')
+
+
+def apply_schema(key, df):
+    """
+    DataFrame을 key 의 스키마에 맞는 컬럼과 작은 dtype 으로 변환합니다. 스키마가 없는 키는 그대로 반환합니다.
+
+    메모리를 줄이기 위한 변환이며 값 자체는 바뀌지 않습니다(float32 는 유효숫자 7자리).
+    화면에 표시하는 값은 모두 반올림 형식으로 출력되므로 표시 결과는 같습니다.
+    """
+    schema = SCHEMAS.get(key)
+    if schema is None:
+        return df
+    columns = {}
+    for column in df.columns:
+        kind = schema_kind(key, column)
+        if kind is None or (kind != 'rank' and column not in schema['columns'] and not pd.api.types.is_numeric_dtype(df[column])):
+            continue
+        columns[column] = _coerce(df[column], kind)
+    return pd.DataFrame(columns, index=df.index)
+
+
+def dropped_rank_columns(source, df):
+    """
+    source(원본)에 있던 순위 컬럼 중 df(apply_schema 결과)에 없는 컬럼 목록을 반환합니다.
+    범위 문자열 순위(GRAS_*_Rank 등)가 스키마 변환에서 빠지지 않았는지 로딩 시 확인하는 데 사용합니다.
+    """
+    return [column for column in source.columns if is_rank_column(column) and column not in df.columns]
+
+
+def years(df):
+    """
+    DataFrame의 년도 목록을 오름차순 int 리스트로 반환합니다.
+    """
+    if 'Year' not in df.columns:
+        return []
+    return sorted({int(year) for year in df['Year'].dropna().unique()})
+
+
+def schema_kind(key, column):
+    """
+    스키마에서 컬럼의 종류(year, metric, rank, ...)를 반환합니다. 선언되지 않은 컬럼은 extra 종류이며,
+    extra 가 있는 스키마의 미선언 순위 컬럼은 rank 입니다.
+    """
+    schema = SCHEMAS[key]
+    kind = schema['columns'].get(column)
+    if kind is None and schema['extra'] is not None and is_rank_column(column):
+        return 'rank'
+    return schema['extra'] if kind is None else kind
+
+
+def columns_of(key, df, kind):
+    """
+    df 에서 스키마상 kind 종류인 컬럼 목록을 반환합니다. 예) columns_of('df_global', df, 'metric')
+    """
+    return [column for column in df.columns if schema_kind(key, column) == kind]
+
+
+def build_snapshots(data_dir='data'):
+    """
+    data 디렉터리의 모든 .xlsx 파일에 대해 스냅샷을 미리 생성합니다.
+    배포 전에 실행해 두면 첫 부팅부터 엑셀 파싱 없이 시작할 수 있습니다.
+    """
+    built = []
+    for name in sorted(os.listdir(data_dir)):
+        if name.endswith('.xlsx') and not name.startswith('~$'):
+            path = os.path.join(data_dir, name)
+            read_excel_cached(path)
+            built.append(path)
+    return built
+
+
+if __name__ == '__main__':
+    for built_path in build_snapshots():
+        print(f"Snapshot ready: {built_path}")
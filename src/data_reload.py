@@ -0,0 +1,370 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+
+from src import figure_cache, raw_ingest
+from src.snapshot import freeze
+from src.data_handler import read_excel_cached, dataset_version, normalize_rank_columns, apply_schema, schema_columns, dropped_rank_columns
+from src.metric_store import build_metric_store
+from src.delta_table import build_delta_tables
+from src.peer_benchmark import PEER_COLUMNS, build_peer_benchmark
+from src.country_mix import build_country_mix
+
+# global_data 키별 원본 엑셀 경로
+DATA_SOURCES = {
+    'df_reputation': 'data/reputation.xlsx',
+    'df_research': 'data/research.xlsx',
+    'df_cooperation': 'data/cooperation.xlsx',
+    'df_global': 'data/global.xlsx',
+    # 여러 대학의 순위를 모은 비교 순위표 (long format, src/peer_benchmark.py 참고)
+    'df_peers': 'data/peers.xlsx',
+}
+
+# 원본 엑셀이 없을 때 사용할 임시 데이터
+FALLBACK_DATA = {
+    'df_reputation': {
+        'Year': [2024, 2025, 2026],
+        'QS_Rank': [850, 800, 750],
+        'QS_Rank_Domestic': [15, 12, 10],
+        'THE_Rank': [900, 850, 800],
+        'THE_Rank_Domestic': [20, 18, 16],
+        'ARWU_Rank': [700, 650, 600],
+        'ARWU_Rank_Domestic': [10, 9, 8],
+        'QS_Overall': [16.53, 20.0, 30.8],
+        'QS_Academic_Reputation': [4.5, 5.0, 7.9],
+        'QS_Citations_Per_Faculty': [18.1, 25.0, 31.0],
+        'QS_Faculty_Student_Ratio': [85.0, 90.0, 97.4],
+        'QS_Employer_Reputation': [3.2, 4.0, 6.0]
+    },
+    'df_research': {
+        'Year': [2023, 2024, 2025],
+        'Funding': [100, 120, 150],
+        'Citation': [1500, 1650, 1800]
+    },
+    'df_cooperation': {
+        'Year': [2023, 2024, 2025],
+        'Tech_transfer': [5, 8, 12],
+        'Patent_application': [50, 60, 70],
+        'Patent_registration': [30, 40, 50],
+        'Internship_rate': [0.15, 0.18, 0.22]
+    },
+    'df_global': {
+        'Year': [2023, 2024, 2025],
+        'Total_students': [500, 600, 750],
+        '중국': [200, 250, 300],
+        '베트남': [150, 180, 200],
+        '말레이시아': [100, 120, 150],
+        '기타': [50, 50, 100]
+    },
+    # 비교 순위표는 임시 데이터 없이 빈 표로 두며, 이 경우 비교 정보를 표시하지 않습니다.
+    'df_peers': {column: [] for column in PEER_COLUMNS},
+}
+
+# 변경 감지 주기(초). 0 이하이면 백그라운드 감시를 하지 않습니다.
+RELOAD_INTERVAL = float(os.environ.get('CUK_RELOAD_INTERVAL', '30'))
+
+# 여러 엑셀을 동시에 읽을 작업자 수. 1 이면 차례로 읽습니다.
+LOAD_WORKERS = int(os.environ.get('CUK_LOAD_WORKERS', str(os.cpu_count() or 1)))
+# 동시 로딩 방식: process(기본값) | thread
+# 엑셀 파싱은 openpyxl/calamine 모두 GIL 을 잡고 있어 스레드로는 빨라지지 않으므로 fork 한 프로세스에서 파싱합니다.
+# 다른 스레드가 실행 중이면(gunicorn 스레드 워커, 변경 감시, 빠른 부팅 준비 스레드 등) 그 스레드가 잡고 있던 잠금이
+# 자식 프로세스에 잠긴 채로 복사되어 멈출 수 있으므로, fork 는 현재 스레드가 유일한 스레드일 때(부팅 시 임포트)만 사용하고
+# 그 밖에는 스레드를 사용합니다. fork 를 지원하지 않는 환경(Windows)에서도 스레드를 사용합니다.
+LOAD_POOL = os.environ.get('CUK_LOAD_POOL', 'process')
+
+# 현재 서비스 중인 데이터(읽기 전용 DataSnapshot). 교체는 항상 새 스냅샷을 만든 뒤 참조만 바꿉니다 (src/snapshot.py).
+_current = None
+_source_stats = {}
+_listeners = []
+_lock = threading.Lock()
+_watcher = None
+# 원본 경로 -> 마지막 로딩 시간(초)
+_load_timings = {}
+
+
+def _stat(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _source_stat(key):
+    # 엑셀과 원본 레코드 파일(raw_ingest)의 상태. 둘 다 없으면 None 입니다.
+    stat, raw = _stat(DATA_SOURCES[key]), raw_ingest.signature(key)
+    if stat is None and not raw:
+        return None
+    return stat, raw
+
+
+def read_source(key):
+    """
+    global_data 키에 해당하는 엑셀을 스키마(data_handler.SCHEMAS)의 컬럼과 dtype 으로 읽습니다.
+    한 번 파싱한 엑셀은 컬럼 스냅샷으로 저장되어 다음 부팅부터 재사용됩니다.
+    data/raw/ 에 원본 레코드가 있으면 년도별로 집계해 엑셀의 같은 지표를 대체합니다 (raw_ingest).
+    엑셀과 원본 레코드가 모두 없으면 FileNotFoundError 입니다.
+    """
+    raw = raw_ingest.aggregate(key)
+    try:
+        df = read_excel_cached(DATA_SOURCES[key], keep=schema_columns(key))
+    except FileNotFoundError:
+        if raw is None:
+            raise
+        # 엑셀이 없으면 원본 레코드로 만들 수 없는 지표(현장실습 이수율 등)는 빈 값으로 둡니다.
+        df = pd.DataFrame(columns=list(FALLBACK_DATA[key]))
+    source = raw_ingest.merge(df, raw)
+    df = apply_schema(key, source)
+    # 범위 문자열 순위(GRAS_*_Rank 등)가 스키마 변환에서 빠지면 순위 카드와 증감이 조용히 사라지므로 알립니다.
+    dropped = dropped_rank_columns(source, df)
+    if dropped:
+        print(f"Warning: rank columns dropped from {DATA_SOURCES[key]}: {', '.join(dropped)}")
+    return df
+
+
+def load_source(key):
+    """
+    read_source() 와 같지만, 파일이 없으면 임시 데이터를 사용합니다.
+    """
+    path = DATA_SOURCES[key]
+    try:
+        return read_source(key)
+    except FileNotFoundError as e:
+        print(f"Error: {e}. Please ensure {os.path.basename(path)} is in the 'data' directory. Using temporary data.")
+        return apply_schema(key, pd.DataFrame(FALLBACK_DATA[key]))
+
+
+def _timed(func, arg):
+    # 작업자 프로세스에서 실행되므로 예외도 결과로 돌려보냅니다.
+    start = time.perf_counter()
+    try:
+        value, error = func(arg), None
+    except Exception as e:
+        value, error = None, e
+    return value, error, time.perf_counter() - start
+
+
+def _executor(workers):
+    if LOAD_POOL == 'process' and threading.active_count() == 1 and 'fork' in multiprocessing.get_all_start_methods():
+        return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('fork'))
+    return ThreadPoolExecutor(workers, thread_name_prefix='data-load')
+
+
+def _load_parallel(func, args):
+    """
+    args 마다 func(arg) 를 동시에 실행하고 (값, 예외, 걸린 시간) 목록을 args 순서대로 반환합니다.
+    전체 시간은 가장 오래 걸린 파일에 맞춰지며, 파일이 하나이거나 LOAD_WORKERS 가 1 이면 현재 프로세스에서 읽습니다.
+    """
+    workers = min(LOAD_WORKERS, len(args))
+    if workers <= 1:
+        return [_timed(func, arg) for arg in args]
+    with _executor(workers) as executor:
+        return list(executor.map(_timed, [func] * len(args), args))
+
+
+def _report(paths, results, elapsed):
+    for path, (_, _, seconds) in zip(paths, results):
+        _load_timings[path] = seconds
+    details = ', '.join(f'{path} {seconds:.2f}s' for path, (_, _, seconds) in zip(paths, results))
+    print(f"Loaded {len(paths)} data source(s) in {elapsed:.2f}s ({details})")
+
+
+def load_sources(keys):
+    """
+    여러 global_data 키의 엑셀을 동시에 읽어 {키: DataFrame} 으로 반환하고 파일별 로딩 시간을 출력합니다.
+    """
+    keys = list(keys)
+    start = time.perf_counter()
+    results = _load_parallel(load_source, keys)
+    _report([DATA_SOURCES[key] for key in keys], results, time.perf_counter() - start)
+    frames = {}
+    for key, (df, error, _) in zip(keys, results):
+        if error is not None:
+            raise error
+        frames[key] = df
+    return frames
+
+
+def load_timings():
+    """
+    원본 파일별 마지막 로딩 시간(초)을 반환합니다.
+    """
+    return dict(_load_timings)
+
+
+def attach_derived(data, keys=None):
+    """
+    DataFrame으로부터 파생되는 데이터(순위 숫자 컬럼, 국가별 유학생 수, 메트릭 스토어, 증감표, 비교 순위, 데이터셋 버전)를 계산해 data 에 채웁니다.
+    keys 를 주면 그 DataFrame만 순위 컬럼을 변환하고, 이미 변환된(공유 중인) 나머지는 그대로 둡니다.
+    """
+    # 순위 범위 문자열은 로딩 시 한 번만 숫자형 하한/상한/중간값 컬럼으로 변환합니다.
+    for key in DATA_SOURCES if keys is None else keys:
+        if key in data:
+            data[key] = normalize_rank_columns(data[key])
+    # 국가별 유학생 수는 long format 국가 표(country_mix)로 옮기고, df_global 에는 년도별 합계만 남깁니다.
+    build_country_mix(data)
+    data['metric_store'] = build_metric_store(data)
+    data['delta_table'] = build_delta_tables(data)
+    data['peer_benchmark'] = build_peer_benchmark(data)
+    frames = {key: value for key, value in data.items() if key.startswith('df_')}
+    if 'country_mix' in data:
+        frames['countries'] = data['country_mix'].table
+    data['data_version'] = dataset_version(frames)
+    return data
+
+
+def publish(data):
+    """
+    초기 데이터를 읽기 전용 스냅샷으로 바꾸어 현재 데이터로 등록하고, 이후 변경 감지의 기준이 되는 원본 파일 상태를 기록합니다.
+    등록한 스냅샷을 반환합니다.
+    """
+    global _current
+    data = freeze(data)
+    with _lock:
+        _current = data
+        _source_stats.clear()
+        for key in DATA_SOURCES:
+            if key in data:
+                _source_stats[key] = _source_stat(key)
+    return data
+
+
+def current():
+    """
+    현재 서비스 중인 데이터 스냅샷(DataSnapshot)을 반환합니다. 읽기 전용이며, 한 요청 안에서는 받은 스냅샷만 사용합니다.
+    """
+    return _current
+
+
+def subscribe(listener):
+    """
+    데이터가 교체될 때마다 listener(new_data) 가 호출되도록 등록합니다.
+    """
+    _listeners.append(listener)
+
+
+def _replace(new_data):
+    # _lock 을 잡은 상태에서 호출합니다. 등록한 스냅샷을 반환합니다.
+    global _current
+    _current = new_data = freeze(new_data)
+    figure_cache.invalidate(new_data.version)
+    for listener in _listeners:
+        listener(new_data)
+    return new_data
+
+
+def require(keys):
+    """
+    keys 의 데이터가 모두 로드된 현재 데이터 스냅샷을 반환합니다.
+
+    아직 로드되지 않은 데이터만 읽어 새 스냅샷으로 교체하므로, 페이지가 처음 요청될 때
+    그 페이지가 사용하는 엑셀만 읽게 됩니다. 이미 로드되어 있으면 잠금 없이 바로 반환합니다.
+    엑셀은 잠금 밖에서 읽고, 잠금은 새 스냅샷으로 교체할 때만 잡습니다. 읽는 동안 다른 요청이나 변경 감시가
+    스냅샷을 교체했으면 읽은 DataFrame은 그대로 두고 새 스냅샷을 기준으로 다시 만듭니다.
+    """
+    data = _current
+    if data is not None and all(key in data for key in keys):
+        return data
+    frames, stats = {}, {}
+    while True:
+        base = _current
+        missing = [key for key in keys if key not in base]
+        if not missing:
+            return base
+        loading = [key for key in missing if key not in frames]
+        if loading:
+            # 읽기 전에 파일 상태를 기록해, 읽는 중에 바뀐 파일은 다음 변경 감지에서 다시 읽습니다.
+            stats.update((key, _source_stat(key)) for key in loading)
+            frames.update(load_sources(loading))
+        new_data = dict(base)
+        new_data.update((key, frames[key]) for key in missing)
+        attach_derived(new_data, missing)
+        with _lock:
+            if _current is base:
+                _source_stats.update((key, stats[key]) for key in missing)
+                return _replace(new_data)
+
+
+def reload_changed():
+    """
+    원본 파일(엑셀, 원본 레코드) 중 mtime/크기가 바뀐 데이터만 다시 읽어 새 데이터로 교체합니다.
+    원본 레코드는 덧붙여진 행만 읽어 집계를 갱신합니다.
+
+    새 스냅샷을 완성한 뒤 참조를 한 번에 바꾸므로, 처리 중인 요청은 이전 데이터를,
+    이후 요청은 새 데이터를 일관되게 보게 됩니다. 교체 시 그래프 캐시도 함께 무효화됩니다.
+    파일은 잠금 밖에서 읽으며, 그 사이 다른 요청이 스냅샷을 교체했으면 이번에는 교체하지 않고 다음 주기에 다시 읽습니다.
+    데이터가 교체되었으면 True 를 반환합니다.
+    """
+    with _lock:
+        base = _current
+        known = dict(_source_stats)
+    if base is None:
+        return False
+    stats = {}
+    for key in DATA_SOURCES:
+        # 아직 어떤 페이지도 요청하지 않은 데이터는 감시하지 않습니다.
+        if key not in base:
+            continue
+        stat = _source_stat(key)
+        # 파일이 삭제된 경우에는 기존 데이터를 그대로 유지합니다.
+        if stat is None or stat == known.get(key):
+            continue
+        stats[key] = stat
+    if not stats:
+        return False
+
+    # 바뀐 파일들은 동시에 읽습니다.
+    paths = [DATA_SOURCES[key] for key in stats]
+    start = time.perf_counter()
+    results = _load_parallel(read_source, list(stats))
+    _report(paths, results, time.perf_counter() - start)
+    changed = {}
+    new_stats = {}
+    for (key, stat), path, (df, error, _) in zip(stats.items(), paths, results):
+        if error is not None:
+            # 저장 중인 파일 등은 다음 주기에 다시 시도합니다.
+            print(f"Warning: could not reload {path}: {error}")
+            continue
+        changed[key] = df
+        new_stats[key] = stat
+    if not changed:
+        return False
+
+    new_data = dict(base)
+    new_data.update(changed)
+    attach_derived(new_data, changed)
+    with _lock:
+        if _current is not base:
+            return False
+        _source_stats.update(new_stats)
+        if new_data['data_version'] == base['data_version']:
+            return False
+        _replace(new_data)
+    print(f"Reloaded {', '.join(DATA_SOURCES[key] for key in changed)} (data version {new_data['data_version']})")
+    return True
+
+
+def _watch(interval):
+    while True:
+        time.sleep(interval)
+        try:
+            reload_changed()
+        except Exception as e:
+            print(f"Warning: data reload failed: {e}")
+
+
+def start_watcher(interval=None):
+    """
+    원본 파일 변경을 주기적으로 확인하는 데몬 스레드를 시작합니다. 워커 프로세스마다 한 번만 시작됩니다.
+    """
+    global _watcher
+    interval = RELOAD_INTERVAL if interval is None else interval
+    if interval <= 0 or _watcher is not None:
+        return None
+    _watcher = threading.Thread(target=_watch, args=(interval,), name='data-reload', daemon=True)
+    _watcher.start()
+    return _watcher
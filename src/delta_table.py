@@ -0,0 +1,175 @@
+import numpy as np
+import pandas as pd
+
+from src.data_handler import is_rank_column
+from src.metric_store import DOMAIN_FRAMES
+
+# 로딩 시 미리 계산해 두는 비교 기간(년)
+GROWTH_PERIODS = (1, 3, 5)
+
+
+def metric_columns(df):
+    """
+    증감을 계산할 숫자형 지표 컬럼을 반환합니다.
+    순위는 범위 문자열 대신 로딩 시 만든 중간값(<컬럼>_Mid)만 사용합니다.
+    """
+    columns = []
+    for column in df.columns:
+        if column == 'Year' or is_rank_column(column):
+            continue
+        if isinstance(column, str) and column.endswith(('_Low', '_High')) and is_rank_column(column.rsplit('_', 1)[0]):
+            continue
+        if pd.api.types.is_numeric_dtype(df[column]) and not pd.api.types.is_bool_dtype(df[column]):
+            columns.append(column)
+    return columns
+
+
+def _growth(current, base, periods):
+    # 증감, 증감률, 연평균 성장률(CAGR)을 배열 단위로 계산합니다. 계산할 수 없는 값은 NaN 입니다.
+    with np.errstate(divide='ignore', invalid='ignore'):
+        delta = current - base
+        pct = np.where(base != 0, current / base - 1, np.nan)
+        if periods > 0:
+            cagr = np.where((current > 0) & (base > 0), np.power(current / base, 1.0 / periods) - 1, np.nan)
+        else:
+            cagr = np.full_like(delta, np.nan)
+    return delta, pct, cagr
+
+
+class Comparison:
+    """
+    한 도메인의 (선택 년도, 기준 년도) 비교 결과입니다. 모든 지표 컬럼의 값이 배열로 들어 있어
+    카드는 comparison.delta('Funding') 처럼 조회만 합니다. 값이 없으면 NaN 을 반환합니다.
+    """
+    __slots__ = ('year', 'base_year', '_positions', '_value', '_base', '_delta', '_pct', '_cagr')
+
+    def __init__(self, year, base_year, positions, value, base, delta, pct, cagr):
+        self.year = year
+        self.base_year = base_year
+        self._positions = positions
+        self._value = value
+        self._base = base
+        self._delta = delta
+        self._pct = pct
+        self._cagr = cagr
+
+    def _get(self, values, column):
+        position = self._positions.get(column)
+        return np.nan if position is None else float(values[position])
+
+    def value(self, column):
+        return self._get(self._value, column)
+
+    def base(self, column):
+        return self._get(self._base, column)
+
+    def delta(self, column):
+        return self._get(self._delta, column)
+
+    def pct(self, column):
+        return self._get(self._pct, column)
+
+    def cagr(self, column):
+        return self._get(self._cagr, column)
+
+    @property
+    def periods(self):
+        return self.year - self.base_year
+
+
+class DeltaTable:
+    """
+    한 도메인의 지표를 년도 x 컬럼 배열로 정리하고, 1/3/5년 증감·증감률·CAGR 을 로딩 시 계산해 둡니다.
+
+    같은 년도가 여러 번 나오면 DomainStore 와 같이 첫 번째 행을 사용하며, 중간에 빠진 년도는 NaN 으로 채워
+    diff(k) 가 항상 정확히 k년 전과 비교되도록 합니다. 그 밖의 기준 년도는 처음 요청될 때 같은 배열에서
+    한 번 계산해 저장합니다(표 안의 년도 쌍만 저장하므로 크기는 년도 수의 제곱을 넘지 않습니다).
+    """
+    __slots__ = ('name', 'columns', 'wide', 'growth', '_positions', '_first', '_values', '_comparisons')
+
+    def __init__(self, name, df):
+        self.name = name
+        self.columns = tuple(metric_columns(df)) if 'Year' in df.columns else ()
+        self._positions = {column: i for i, column in enumerate(self.columns)}
+        self._comparisons = {}
+
+        frame = df[df['Year'].notna()].drop_duplicates('Year') if 'Year' in df.columns else df.iloc[0:0]
+        wide = frame.set_index(frame['Year'].astype('int64') if len(frame) else pd.Index([], dtype='int64'))
+        wide = wide.loc[:, list(self.columns)].astype('float64')
+        if len(wide):
+            wide = wide.reindex(pd.RangeIndex(wide.index.min(), wide.index.max() + 1))
+        wide.index.name = 'Year'
+        self.wide = wide
+        self._first = int(wide.index[0]) if len(wide) else 0
+        self._values = wide.to_numpy()
+
+        parts = []
+        for periods in GROWTH_PERIODS:
+            # k년 전 행을 아래로 밀어 둔 배열과 한 번에 비교합니다 (DataFrame.diff(k)/pct_change(k) 와 같은 결과).
+            base = np.full_like(self._values, np.nan)
+            base[periods:] = self._values[:-periods]
+            arrays = (base,) + _growth(self._values, base, periods)
+            for i, year in enumerate(wide.index):
+                self._comparisons[(int(year), int(year) - periods)] = Comparison(
+                    int(year), int(year) - periods, self._positions, self._values[i], *(array[i] for array in arrays)
+                )
+            parts.append(pd.DataFrame({
+                'Year': np.repeat(wide.index.to_numpy(), len(self.columns)),
+                'Metric': np.tile(np.asarray(self.columns, dtype=object), len(wide)),
+                'Periods': periods,
+                'Value': self._values.ravel(), 'Base_Value': arrays[0].ravel(), 'Delta': arrays[1].ravel(),
+                'Pct_Change': arrays[2].ravel(), 'CAGR': arrays[3].ravel(),
+            }))
+        # 기획 보고용 long format 표 (값이 없는 년도는 제외)
+        growth = pd.concat(parts, ignore_index=True)
+        self.growth = growth[growth['Value'].notna()].reset_index(drop=True)
+
+    def _row(self, year):
+        index = year - self._first
+        if 0 <= index < len(self._values):
+            return self._values[index]
+        return None
+
+    def compare(self, year, base_year=None):
+        """
+        선택 년도와 기준 년도(기본값: 전년도)의 비교 결과를 반환합니다.
+        기준 년도가 선택 년도와 같거나 표에 없는 년도이면 비교하지 않으며(증감은 NaN), 이 결과는 저장하지 않습니다.
+        저장되는 비교 결과는 표의 년도 쌍으로 한정됩니다.
+        """
+        year = int(year)
+        base_year = year - 1 if base_year is None else int(base_year)
+        key = (year, base_year)
+        comparison = self._comparisons.get(key)
+        if comparison is None:
+            current, base = self._row(year), self._row(base_year)
+            if current is None or base is None or base_year == year:
+                empty = np.full(len(self.columns), np.nan)
+                current = empty if current is None else current
+                return Comparison(year, base_year, self._positions, current, empty, empty, empty, empty)
+            comparison = Comparison(year, base_year, self._positions, current, base, *_growth(current, base, year - base_year))
+            self._comparisons[key] = comparison
+        return comparison
+
+
+class DeltaTables:
+    """
+    모든 도메인의 DeltaTable 을 묶어 페이지 콜백에서 공유하는 조회 API를 제공합니다.
+    """
+    __slots__ = ('_tables',)
+
+    def __init__(self, frames):
+        self._tables = {name: DeltaTable(name, df) for name, df in frames.items()}
+
+    def table(self, name):
+        return self._tables[name]
+
+    def compare(self, name, year, base_year=None):
+        return self._tables[name].compare(year, base_year)
+
+
+def build_delta_tables(global_data):
+    """
+    global_data 의 도메인별 DataFrame으로 DeltaTables 를 생성합니다.
+    """
+    frames = {name: global_data[key] for name, key in DOMAIN_FRAMES.items() if key in global_data}
+    return DeltaTables(frames)
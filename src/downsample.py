@@ -0,0 +1,124 @@
+import os
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objs as go
+
+# 꺾은선 trace 하나가 이 점 수를 넘으면 LTTB 로 줄이고 WebGL(scattergl)로 그립니다.
+# 확대하면 보이는 구간만 다시 이 점 수 이내로 보내므로, 점이 적은 구간은 원래 해상도로 표시됩니다.
+MAX_POINTS = int(os.environ.get('CUK_MAX_POINTS', '1000'))
+
+
+def lttb_indices(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets 알고리즘으로 남길 점의 인덱스를 반환합니다.
+
+    첫 점과 마지막 점은 항상 남기고, 나머지는 threshold-2 개의 구간마다 직전에 고른 점과
+    다음 구간 평균점이 이루는 삼각형의 넓이가 가장 큰 점 하나를 고릅니다. 봉우리와 골짜기가 유지됩니다.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    # 구간별 평균점은 누적합으로 한 번에 계산합니다.
+    cx = np.concatenate(([0.0], np.cumsum(x)))
+    cy = np.concatenate(([0.0], np.cumsum(y)))
+    starts, ends = edges[:-1], edges[1:]
+    counts = ends - starts
+    avg_x = (cx[ends] - cx[starts]) / counts
+    avg_y = (cy[ends] - cy[starts]) / counts
+    # 마지막 구간의 '다음 구간'은 마지막 점입니다.
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = starts[i], ends[i]
+        area = np.abs(
+            (x[a] - next_x[i]) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (next_y[i] - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def _numeric(values):
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype('datetime64[ns]').astype('int64').astype('float64')
+    return values.astype('float64')
+
+
+def _bound(value, values):
+    # relayoutData 의 범위 값은 숫자(년도) 또는 날짜 문자열입니다.
+    if np.issubdtype(values.dtype, np.datetime64):
+        return np.datetime64(pd.Timestamp(value).to_datetime64(), 'ns').astype(values.dtype)
+    return float(value)
+
+
+def line_trace(x, y, x_range=None, **kwargs):
+    """
+    꺾은선 trace 를 만듭니다. kwargs 는 go.Scatter 와 같습니다.
+
+    점 수가 MAX_POINTS 이하이면 지금처럼 go.Scatter 를 그대로 반환합니다.
+    넘으면 NaN 을 뺀 뒤 LTTB 로 MAX_POINTS 개만 남기고 go.Scattergl 로 반환합니다.
+    x_range(시작, 끝)를 주면 그 구간의 점만 사용합니다(확대 시 원래 해상도 표시용).
+    """
+    if x_range is None and len(x) <= MAX_POINTS:
+        return go.Scatter(x=x, y=y, **kwargs)
+
+    x_values = np.asarray(x)
+    if x_values.dtype == object:
+        x_values = np.asarray(pd.to_datetime(x_values))
+    y_values = np.asarray(y, dtype='float64')
+    keep = ~np.isnan(y_values)
+    if x_range is not None:
+        low, high = (_bound(value, x_values) for value in x_range)
+        keep &= (x_values >= low) & (x_values <= high)
+    x_values, y_values = x_values[keep], y_values[keep]
+    # 확대 구간의 점이 적으면 원래 해상도 그대로, 많으면 다시 줄입니다.
+    if len(x_values) > MAX_POINTS:
+        order = np.argsort(x_values, kind='stable')
+        x_values, y_values = x_values[order], y_values[order]
+        index = lttb_indices(_numeric(x_values), y_values, MAX_POINTS)
+        x_values, y_values = x_values[index], y_values[index]
+    return go.Scattergl(x=x_values, y=y_values, **kwargs)
+
+
+def keep_zoom(fig):
+    """
+    줄인(scattergl) trace 가 있는 figure 에 uirevision 을 지정해, 확대 후 데이터만 바꿔도
+    브라우저의 확대 상태가 유지되도록 합니다. 줄인 trace 가 없으면 figure 를 그대로 둡니다.
+    """
+    if any(trace.type == 'scattergl' for trace in fig.data):
+        fig.update_layout(uirevision='downsampled')
+    return fig
+
+
+def needs_downsampling(*frames):
+    """
+    주어진 DataFrame 중 하나라도 MAX_POINTS 보다 행이 많으면 True 입니다.
+    """
+    return any(len(df) > MAX_POINTS for df in frames)
+
+
+def zoom_range(relayout_data, axis='xaxis'):
+    """
+    dcc.Graph 의 relayoutData 에서 확대 구간을 꺼냅니다.
+    전체 보기(autorange)로 돌아가면 None, 축 범위와 관계없는 변경이면 False 를 반환합니다.
+    """
+    if not relayout_data:
+        return False
+    if relayout_data.get(f'{axis}.autorange'):
+        return None
+    if f'{axis}.range[0]' in relayout_data and f'{axis}.range[1]' in relayout_data:
+        return relayout_data[f'{axis}.range[0]'], relayout_data[f'{axis}.range[1]']
+    if f'{axis}.range' in relayout_data:
+        return tuple(relayout_data[f'{axis}.range'])
+    return False
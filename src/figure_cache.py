@@ -0,0 +1,48 @@
+import json
+import threading
+
+# (그래프 이름, 데이터셋 버전) -> 직렬화된 figure(dict)
+_figures = {}
+_lock = threading.Lock()
+# 생성 중인 figure 별 잠금. 같은 figure 는 한 번만 만들고, 다른 figure 는 다른 스레드에서 동시에 만들 수 있습니다.
+_building = {}
+
+
+def get_figure(name, version, build):
+    """
+    캐시된 figure를 반환하고, 없으면 build()로 한 번만 생성합니다.
+
+    go.Figure 는 JSON으로 한 번 직렬화한 뒤 순수 dict 로 저장하므로,
+    이후 요청에서는 plotly 검증/변환 없이 그대로 dcc.Graph 에 전달됩니다.
+    반환된 dict 는 여러 요청이 공유하므로 수정하지 않아야 합니다.
+    """
+    key = (name, version)
+    figure = _figures.get(key)
+    if figure is None:
+        with _lock:
+            building = _building.setdefault(key, threading.Lock())
+        try:
+            with building:
+                figure = _figures.get(key)
+                if figure is None:
+                    figure = json.loads(build().to_json())
+                    with _lock:
+                        _figures[key] = figure
+        finally:
+            # build() 가 실패해도 잠금을 남기지 않습니다. 기다리던 스레드는 캐시가 비어 있으면 다시 생성합니다.
+            with _lock:
+                if _building.get(key) is building:
+                    del _building[key]
+    return figure
+
+
+def invalidate(version=None):
+    """
+    캐시를 비웁니다. version 을 주면 해당 버전이 아닌 figure 만 제거합니다.
+    """
+    with _lock:
+        if version is None:
+            _figures.clear()
+        else:
+            for key in [key for key in _figures if key[1] != version]:
+                del _figures[key]
@@ -2,50 +2,34 @@ import dash
 from dash.dependencies import Input, Output, State
 from dash import html
 
-# 각 페이지의 레이아웃을 임포트합니다.
-from src.pages.summary.summary_layouts import summary_layout
-# from src.pages.reputation.reputation_layouts import reputation_layout # 추후 추가될 페이지
+# 각 페이지의 레이아웃은 page_registry 가 처음 요청될 때 임포트합니다.
+from src import page_registry, response_cache
 
 def register_callbacks(app):
     """
     최상위 메뉴 이동 및 활성화 상태 변경을 위한 콜백을 등록합니다.
     """
+    # 페이지 레이아웃은 메뉴 클릭 수와 데이터 버전만으로 정해지므로 응답을 캐시합니다.
+    response_cache.cache_outputs('page-content')
+
     @app.callback(
         Output('page-content', 'children'),
-        Output('menu-summary', 'className'),
-        Output('menu-reputation', 'className'),
-        # Output('menu-research', 'className'), # 추후 추가
-        # Output('menu-cooperation', 'className'), # 추후 추가
-        # Output('menu-global', 'className'), # 추후 추가
-        Input('menu-summary', 'n_clicks'),
-        Input('menu-reputation', 'n_clicks'),
-        # Input('menu-research', 'n_clicks'), # 추후 추가
-        # Input('menu-cooperation', 'n_clicks'), # 추후 추가
-        # Input('menu-global', 'n_clicks'), # 추후 추가
+        *[Output(page.menu_id, 'className') for page in page_registry.PAGES],
+        *[Input(page.menu_id, 'n_clicks') for page in page_registry.PAGES],
     )
-    def display_page(summary_clicks, reputation_clicks):
+    def display_page(*menu_clicks):
         """
         메뉴 버튼 클릭에 따라 다른 페이지 레이아웃을 반환합니다.
         """
         ctx = dash.callback_context
-        button_id = 'menu-summary' # 기본값 설정
+        button_id = page_registry.get_page(page_registry.DEFAULT_PAGE).menu_id # 기본값 설정
 
         if ctx.triggered:
             button_id = ctx.triggered[0]['prop_id'].split('.')[0]
-        
-        # 메뉴별 CSS 클래스 업데이트
-        summary_class = 'menu-button'
-        reputation_class = 'menu-button'
 
-        if button_id == 'menu-summary':
-            summary_class = 'menu-button active'
-            content = summary_layout
-        elif button_id == 'menu-reputation':
-            reputation_class = 'menu-button active'
-            content = html.H2("평판도 페이지 콘텐츠") # 평판도 페이지 레이아웃으로 교체 예정
-        else:
-            summary_class = 'menu-button active'
-            content = summary_layout
-
-        return content, summary_class, reputation_class
+        page = page_registry.PAGE_BY_MENU.get(button_id) or page_registry.get_page(page_registry.DEFAULT_PAGE)
+        content = page_registry.render(page.name)
 
+        # 메뉴별 CSS 클래스 업데이트
+        menu_classes = ['menu-button active' if item is page else 'menu-button' for item in page_registry.PAGES]
+        return content, *menu_classes
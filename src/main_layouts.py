@@ -1,15 +1,14 @@
 from dash import dcc, html
-import dash_bootstrap_components as dbc
 
-# 메뉴 버튼에 '요약' 메뉴 추가
+from src.page_registry import PAGES, DEFAULT_PAGE
+
+# 메뉴 버튼은 page_registry 에 등록된 페이지 순서대로 만듭니다.
 menu_container = html.Div(
     className='menu-container',
     children=[
-        html.Button("요약", id="menu-summary", n_clicks=0, className='menu-button active'),
-        html.Button("평판도", id="menu-reputation", n_clicks=0, className='menu-button'),
-        html.Button("연구실적", id="menu-research", n_clicks=0, className='menu-button'),
-        html.Button("산학협력", id="menu-cooperation", n_clicks=0, className='menu-button'),
-        html.Button("글로벌", id="menu-global", n_clicks=0, className='menu-button'),
+        html.Button(page.label, id=page.menu_id, n_clicks=0,
+                    className='menu-button active' if page.name == DEFAULT_PAGE else 'menu-button')
+        for page in PAGES
     ]
 )
 
@@ -40,7 +39,7 @@ main_layout = html.Div(
         ),
 
         # 현재 활성화된 메뉴를 저장하기 위한 dcc.Store
-        dcc.Store(id='current-menu-state', data='menu-summary')
+        dcc.Store(id='current-menu-state', data=f'menu-{DEFAULT_PAGE}')
     ]
 )
 
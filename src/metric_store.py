@@ -0,0 +1,110 @@
+import pandas as pd
+
+# global_data 의 DataFrame 키와 메트릭 스토어의 도메인 이름 매핑
+DOMAIN_FRAMES = {
+    'reputation': 'df_reputation',
+    'research': 'df_research',
+    'cooperation': 'df_cooperation',
+    'global': 'df_global',
+}
+
+
+class YearRecord:
+    """
+    한 도메인의 특정 년도 행을 나타내는 가벼운 레코드입니다.
+    pd.Series 처럼 record['QS_Rank'], record.get('Funding') 으로 값을 읽을 수 있습니다.
+    컬럼 위치 사전은 같은 도메인의 모든 레코드가 공유합니다.
+    """
+    __slots__ = ('_positions', '_values')
+
+    def __init__(self, positions, values):
+        self._positions = positions
+        self._values = values
+
+    def __getitem__(self, column):
+        return self._values[self._positions[column]]
+
+    def __contains__(self, column):
+        return column in self._positions
+
+    def get(self, column, default=None):
+        position = self._positions.get(column)
+        return default if position is None else self._values[position]
+
+    @property
+    def empty(self):
+        return not self._values
+
+
+# 해당 년도 데이터가 없을 때 반환하는 빈 레코드 (기존의 빈 pd.Series 역할)
+EMPTY_RECORD = YearRecord({}, ())
+
+
+class DomainStore:
+    """
+    한 도메인의 DataFrame을 년도 -> YearRecord 사전으로 미리 변환해 둡니다.
+    같은 년도가 여러 번 나오면 기존 로직(.iloc[0])과 같이 첫 번째 행을 사용합니다.
+    """
+    __slots__ = ('name', 'columns', '_records')
+
+    def __init__(self, name, df):
+        self.name = name
+        self.columns = tuple(df.columns)
+        positions = {column: i for i, column in enumerate(self.columns)}
+        self._records = {}
+        if 'Year' not in positions:
+            return
+        years = df['Year'].to_numpy()
+        rows = df.to_numpy(dtype=object)
+        for year, row in zip(years, rows):
+            if pd.isna(year):
+                continue
+            self._records.setdefault(int(year), YearRecord(positions, tuple(row)))
+
+    def record(self, year):
+        if year is None:
+            return EMPTY_RECORD
+        return self._records.get(int(year), EMPTY_RECORD)
+
+    def pair(self, year, prev_year=None):
+        """
+        (선택 년도, 비교 년도) 레코드 쌍을 반환합니다. 비교 년도 기본값은 전년도입니다.
+        """
+        if prev_year is None and year is not None:
+            prev_year = int(year) - 1
+        return self.record(year), self.record(prev_year)
+
+    def years(self):
+        return sorted(self._records)
+
+
+class MetricStore:
+    """
+    모든 도메인의 DomainStore 를 묶어 페이지 콜백에서 공유하는 조회 API를 제공합니다.
+    """
+    __slots__ = ('_domains',)
+
+    def __init__(self, frames):
+        self._domains = {name: DomainStore(name, df) for name, df in frames.items()}
+
+    def domain(self, name):
+        return self._domains[name]
+
+    def record(self, name, year):
+        return self._domains[name].record(year)
+
+    def pair(self, name, year, prev_year=None):
+        return self._domains[name].pair(year, prev_year)
+
+    def years(self, name=None):
+        if name is not None:
+            return self._domains[name].years()
+        return sorted({year for domain in self._domains.values() for year in domain.years()})
+
+
+def build_metric_store(global_data):
+    """
+    global_data 의 도메인별 DataFrame으로 MetricStore 를 생성합니다.
+    """
+    frames = {name: global_data[key] for name, key in DOMAIN_FRAMES.items() if key in global_data}
+    return MetricStore(frames)
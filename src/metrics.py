@@ -0,0 +1,168 @@
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+# 콜백 지연시간 히스토그램 버킷 경계(초)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# 콜백 한 번의 처리 단계
+# - lookup: 데이터 조회 (콜백 코드에서 metrics.phase('lookup') 으로 표시한 구간)
+# - build: 컴포넌트 트리 생성 (콜백 함수 실행 시간 중 lookup 을 제외한 나머지)
+# - serialize: Dash 의 응답 JSON 직렬화 (콜백 함수 밖에서 Dash 가 처리하는 시간)
+# - total: 위 단계를 모두 포함한 전체 시간
+
+METRIC_NAME = 'cuk_dash_callback_seconds'
+
+
+class Histogram:
+    """
+    Prometheus 형식의 누적 히스토그램입니다.
+    """
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += seconds
+        self.count += 1
+
+
+# (콜백 이름, 단계) -> Histogram
+_histograms = {}
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def observe(callback, phase, seconds):
+    with _lock:
+        histogram = _histograms.get((callback, phase))
+        if histogram is None:
+            histogram = _histograms[(callback, phase)] = Histogram()
+        histogram.observe(seconds)
+
+
+@contextmanager
+def phase(name):
+    """
+    콜백 안에서 특정 구간의 시간을 해당 단계로 기록합니다. 콜백 밖에서는 아무것도 하지 않습니다.
+
+        with metrics.phase('lookup'):
+            current, prev = metric_store.pair('reputation', year)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases = getattr(_local, 'phases', None)
+        if phases is not None:
+            phases[name] = phases.get(name, 0.0) + time.perf_counter() - start
+
+
+def _time_function(name, func):
+    """
+    콜백 함수 자체를 감싸 lookup/build 시간을 기록합니다.
+    """
+    @functools.wraps(func)
+    def timed(*args, **kwargs):
+        _local.phases = {}
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            phases, _local.phases = _local.phases, None
+            _local.function_time = elapsed
+            for phase_name, seconds in phases.items():
+                observe(name, phase_name, seconds)
+            observe(name, 'build', max(elapsed - sum(phases.values()), 0.0))
+    return timed
+
+
+def _time_dispatch(name, dispatch):
+    """
+    Dash 가 등록한 콜백 실행 함수(입력 해석, 콜백 호출, 응답 직렬화)를 감싸
+    콜백 함수 밖에서 걸린 시간을 serialize 로, 전체 시간을 total 로 기록합니다.
+    """
+    @functools.wraps(dispatch)
+    def timed(*args, **kwargs):
+        _local.function_time = 0.0
+        start = time.perf_counter()
+        try:
+            return dispatch(*args, **kwargs)
+        finally:
+            total = time.perf_counter() - start
+            observe(name, 'serialize', max(total - _local.function_time, 0.0))
+            observe(name, 'total', total)
+    return timed
+
+
+def instrument_callbacks(app):
+    """
+    app.callback 을 감싸 이후 등록되는 모든 서버 콜백의 단계별 지연시간을 기록합니다.
+    콜백을 등록하기 전에 호출해야 합니다.
+    """
+    register_callback = app.callback
+
+    @functools.wraps(register_callback)
+    def callback(*args, **kwargs):
+        # Dash 는 app.callback(...) 호출 시점에 callback_map 항목을 만들고, 데코레이터 적용 시 실행 함수를 채웁니다.
+        before = set(app.callback_map)
+        register = register_callback(*args, **kwargs)
+
+        def decorator(func):
+            name = func.__name__
+            result = register(_time_function(name, func))
+            for callback_id in set(app.callback_map) - before:
+                entry = app.callback_map[callback_id]
+                entry['callback'] = _time_dispatch(name, entry['callback'])
+            return result
+        return decorator
+
+    app.callback = callback
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_prometheus():
+    """
+    기록된 히스토그램을 Prometheus 텍스트 형식으로 반환합니다.
+    """
+    lines = [
+        f'# HELP {METRIC_NAME} Dash callback latency by phase (lookup, build, serialize, total).',
+        f'# TYPE {METRIC_NAME} histogram',
+    ]
+    with _lock:
+        snapshot = sorted((key, list(h.counts), h.sum, h.count) for key, h in _histograms.items())
+    for (callback, phase_name), counts, total, count in snapshot:
+        labels = f'callback="{_label(callback)}",phase="{_label(phase_name)}"'
+        cumulative = 0
+        for bound, bucket_count in zip(BUCKETS, counts):
+            cumulative += bucket_count
+            lines.append(f'{METRIC_NAME}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{METRIC_NAME}_bucket{{{labels},le="+Inf"}} {count}')
+        lines.append(f'{METRIC_NAME}_sum{{{labels}}} {total}')
+        lines.append(f'{METRIC_NAME}_count{{{labels}}} {count}')
+    return '\n'.join(lines) + '\n'
+
+
+def install(app, path='/metrics'):
+    """
+    콜백 계측을 켜고 app.server 에 Prometheus 수집용 엔드포인트를 추가합니다.
+    히스토그램은 워커 프로세스별로 집계됩니다.
+    """
+    instrument_callbacks(app)
+
+    def metrics_endpoint():
+        return render_prometheus(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+    app.server.add_url_rule(path, 'metrics', metrics_endpoint)
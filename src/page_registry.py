@@ -0,0 +1,100 @@
+import importlib
+
+from dash import html
+
+from src import data_reload
+
+
+class Page:
+    """
+    메뉴 하나에 대응하는 페이지 정보입니다.
+
+    layout/callbacks 는 'module:함수' 형식의 문자열로 적어 두고, 실제 모듈은 필요할 때 임포트합니다.
+    datasets 는 페이지가 사용하는 global_data 키 목록으로, 페이지가 처음 요청될 때 그 데이터만 로드됩니다.
+    layout 이 없는 페이지는 준비 중 안내 문구를 표시합니다.
+    """
+    __slots__ = ('name', 'label', 'layout', 'callbacks', 'datasets', '_build')
+
+    def __init__(self, name, label, layout=None, callbacks=None, datasets=()):
+        self.name = name
+        self.label = label
+        self.layout = layout
+        self.callbacks = callbacks
+        self.datasets = tuple(datasets)
+        self._build = None
+
+    @property
+    def menu_id(self):
+        return f'menu-{self.name}'
+
+
+# 메뉴 순서대로 등록합니다. 새 페이지는 여기에 한 줄을 추가하면 메뉴와 페이지 이동 콜백에 반영됩니다.
+PAGES = [
+    Page('summary', '요약',
+         layout='src.pages.summary.summary_layouts:build_summary_layout',
+         callbacks='src.pages.summary.summary_callbacks:register_callbacks',
+         datasets=('df_reputation', 'df_research', 'df_cooperation', 'df_global', 'df_peers')),
+    Page('reputation', '평판도', datasets=('df_reputation', 'df_peers')),
+    Page('research', '연구실적', datasets=('df_research',)),
+    Page('cooperation', '산학협력', datasets=('df_cooperation',)),
+    Page('global', '글로벌', datasets=('df_global',)),
+]
+PAGE_BY_NAME = {page.name: page for page in PAGES}
+PAGE_BY_MENU = {page.menu_id: page for page in PAGES}
+
+# 첫 화면으로 보여줄 페이지
+DEFAULT_PAGE = 'summary'
+
+
+def _resolve(target):
+    module_name, attr = target.split(':')
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def get_page(name):
+    return PAGE_BY_NAME[name]
+
+
+def page_data(name):
+    """
+    페이지가 선언한 데이터가 모두 로드된 현재 데이터 스냅샷(src/snapshot.py)을 반환합니다.
+    아직 로드되지 않은 데이터는 이때 한 번만 읽습니다.
+    """
+    return data_reload.require(get_page(name).datasets)
+
+
+def render(name):
+    """
+    페이지 레이아웃을 생성합니다. 처음 요청된 페이지는 이때 레이아웃 모듈을 임포트하고 데이터를 로드합니다.
+    """
+    page = get_page(name)
+    page_data(name)
+    if page.layout is None:
+        return html.H2(f"{page.label} 페이지 콘텐츠")  # 페이지 레이아웃으로 교체 예정
+    if page._build is None:
+        page._build = _resolve(page.layout)
+    return page._build()
+
+
+def preload(names):
+    """
+    지정한 페이지의 모듈과 데이터를 미리 로드합니다.
+    gunicorn preload 모드에서 워커 fork 전에 첫 화면을 준비하는 데 사용합니다.
+    """
+    for name in names:
+        page = get_page(name)
+        page_data(name)
+        if page.layout is not None and page._build is None:
+            page._build = _resolve(page.layout)
+
+
+def register_callbacks(app):
+    """
+    각 페이지의 콜백을 등록합니다.
+
+    브라우저는 처음 접속할 때 콜백 목록(/_dash-dependencies)을 한 번만 받으므로 콜백 등록은 시작 시 이루어지며,
+    페이지 데이터는 콜백이 처음 실행될 때 page_data() 로 로드됩니다.
+    """
+    for page in PAGES:
+        if page.callbacks is not None:
+            _resolve(page.callbacks)(app)
@@ -0,0 +1,96 @@
+import plotly.graph_objs as go
+
+from src.downsample import line_trace, keep_zoom
+
+# 요약 페이지의 3개년 추이 그래프 생성 함수들
+# 모두 data(데이터 스냅샷, src/snapshot.py)를 받아 go.Figure 를 반환합니다.
+# 꺾은선은 line_trace 로 만들어 점이 많으면 자동으로 줄여(LTTB) WebGL 로 그리며,
+# x_range(시작, 끝)를 주면 확대된 구간만 원래 해상도로 다시 만듭니다.
+
+
+def _time_axis(df):
+    """
+    x 축으로 쓸 컬럼과 x 축 설정을 반환합니다. 월별 등 날짜(Date) 컬럼이 있으면 날짜 축을 사용합니다.
+    """
+    if 'Date' in df.columns:
+        return df['Date'], dict()
+    return df['Year'], dict(dtick=1)
+
+
+def get_reputation_trend_figure(data, x_range=None):
+    df_reputation = data['df_reputation']
+    item_colors = data['item_colors']
+    x, xaxis = _time_axis(df_reputation)
+    fig = go.Figure()
+
+    for institution in ['QS', 'THE', 'ARWU']:
+        # 범위 순위('801-850')는 로딩 시 계산된 하한 컬럼(801)으로 표시합니다.
+        column = f'{institution}_Rank_Low'
+        if column in df_reputation.columns:
+            fig.add_trace(line_trace(x, df_reputation[column], x_range, mode='lines+markers', name=institution, line=dict(color=item_colors[institution]), marker=dict(color=item_colors[institution])))
+
+    fig.update_layout(
+        title='평가기관별 국제 순위 (3개년 추이)',
+        yaxis=dict(autorange="reversed"),
+        xaxis=xaxis,
+        legend_title="평가기관",
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        margin=dict(l=40, r=40, t=80, b=40)
+    )
+    return keep_zoom(fig)
+
+
+def get_research_trend_figure(data, x_range=None):
+    df_research = data['df_research']
+    item_colors = data['item_colors']
+    x, xaxis = _time_axis(df_research)
+    fig = go.Figure()
+    fig.add_trace(line_trace(x, df_research['Funding'], x_range, mode='lines+markers', name='연구비 수혜실적 (억원)', yaxis='y1', line=dict(color=item_colors['Funding']), marker=dict(color=item_colors['Funding'])))
+    fig.add_trace(line_trace(x, df_research['Citation'], x_range, mode='lines+markers', name='피인용지수', yaxis='y2', line=dict(color=item_colors['Citation']), marker=dict(color=item_colors['Citation'])))
+    fig.update_layout(
+        title='연구비 및 피인용지수 (3개년 추이)',
+        yaxis=dict(title='연구비 (억원)'),
+        xaxis=xaxis,
+        yaxis2=dict(title='피인용지수', overlaying='y', side='right'),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        margin=dict(l=40, r=40, t=80, b=40)
+    )
+    return keep_zoom(fig)
+
+
+def get_cooperation_trend_figure(data, x_range=None):
+    df_cooperation = data['df_cooperation']
+    item_colors = data['item_colors']
+    x, xaxis = _time_axis(df_cooperation)
+    fig = go.Figure()
+    fig.add_trace(go.Bar(name='특허 출원', x=x, y=df_cooperation['Patent_application'], marker_color=item_colors['Patent_application']))
+    fig.add_trace(go.Bar(name='특허 등록', x=x, y=df_cooperation['Patent_registration'], marker_color=item_colors['Patent_registration']))
+    fig.add_trace(line_trace(x, df_cooperation['Internship_rate'] * 100, x_range, mode='lines+markers', name='현장실습 이수율 (%)', yaxis='y2', line=dict(color=item_colors['Internship_rate']), marker=dict(color=item_colors['Internship_rate'])))
+    fig.update_layout(
+        title='산학협력 (3개년 추이)',
+        barmode='group',
+        xaxis=xaxis,
+        yaxis2=dict(title='이수율 (%)', overlaying='y', side='right'),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        margin=dict(l=40, r=40, t=80, b=40)
+    )
+    return keep_zoom(fig)
+
+
+def get_global_trend_figure(data, x_range=None):
+    # 국가가 많아도 전체 기간 상위 국가 + 기타만 그립니다 (src/country_mix.py).
+    country_mix = data['country_mix']
+    trend = country_mix.trend()
+    xaxis = dict() if trend.index.name == 'Date' else dict(dtick=1)
+    fig = go.Figure()
+    for country in trend.columns:
+        color = country_mix.color(country)
+        fig.add_trace(line_trace(trend.index, trend[country], x_range, mode='lines+markers', name=country, line=dict(color=color), marker=dict(color=color)))
+    fig.update_layout(
+        title='외국인 유학생 수 (3개년 추이)',
+        xaxis=xaxis,
+        legend_title="국가",
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        margin=dict(l=40, r=40, t=80, b=40)
+    )
+    return keep_zoom(fig)
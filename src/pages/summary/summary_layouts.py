@@ -1,36 +1,262 @@
-from dash import dcc, html
-import pandas as pd
-
-# 임시 데이터프레임과 년도 목록
-try:
-    df_reputation = pd.read_excel('data/reputation.xlsx')
-except FileNotFoundError:
-    df_reputation = pd.DataFrame({'Year': [2024, 2025, 2026]})
-years = df_reputation['Year'].unique()
-
-summary_layout = html.Div(
-    children=[
-        # 하위 메뉴: 토글 버튼 및 년도 선택 드롭다운
-        html.Div(
-            className="toggle-container",
-            children=[
-                dcc.Dropdown(
-                    id='year-selector',
-                    options=[{'label': str(year), 'value': year} for year in years],
-                    value=years.max(),  # 최신 년도를 초기값으로 설정
-                    clearable=False,
-                    style={'width': '120px', 'margin-right': '20px'}
-                ),
-                html.Div("3개년 추이보기", style={'font-weight': 'bold', 'margin-right': '10px'}),
-                html.Button(id="trend-button", n_clicks=0, className='toggle-button')
-            ]
-        ),
-        
-        # 실제 요약 페이지 콘텐츠가 로드될 영역
+import os
+
+from dash import dcc, html, no_update, Patch
+import plotly.graph_objs as go
+
+from src import data_handler, figure_cache, metrics, page_registry
+from src.components.common_components import (
+    KPI_CARD_FIELDS, RANKING_CARD_FIELDS, build_kpi_card, build_ranking_card, card_outputs, card_updates, kpi_card_state, ranking_card_state
+)
+from src.pages.summary.summary_figures import (
+    get_reputation_trend_figure, get_research_trend_figure, get_cooperation_trend_figure, get_global_trend_figure
+)
+
+# 데이터가 아직 로드되지 않았을 때 사용할 임시 년도 목록
+DEFAULT_YEARS = [2024, 2025, 2026]
+
+# 비교 기준 드롭다운에서 '전년 대비'를 나타내는 값
+PREVIOUS_YEAR = 'prev'
+
+# 클라이언트 전환 모드: KPI/추이 화면을 모두 내려보내고 토글은 브라우저에서만 처리합니다.
+# CUK_CLIENTSIDE_TOGGLE=0 이면 토글마다 서버가 화면을 다시 그리는 기존 방식으로 동작합니다.
+CLIENTSIDE_TOGGLE = os.environ.get('CUK_CLIENTSIDE_TOGGLE', '1') != '0'
+
+# 추이 화면 그래프: (그래프 id, 제목, 캐시 이름, 생성 함수, 사용하는 DataFrame 키)
+TREND_GRAPHS = [
+    ("reputation-trend-graph", "평판도 (3개년 추이)", 'reputation_trend', get_reputation_trend_figure, 'df_reputation'),
+    ("research-trend-graph", "연구실적 (3개년 추이)", 'research_trend', get_research_trend_figure, 'df_research'),
+    ("cooperation-trend-figure", "산학협력 (3개년 추이)", 'cooperation_trend', get_cooperation_trend_figure, 'df_cooperation'),
+    ("global-trend-graph", "글로벌 (3개년 추이)", 'global_trend', get_global_trend_figure, 'df_global'),
+]
+
+def get_trend_figure(data, name, build):
+    """
+    데이터셋 버전별로 캐시된 전체 구간 추이 그래프를 반환합니다.
+    """
+    return figure_cache.get_figure(name, data['data_version'], lambda: build(data))
+
+def build_trend_sections(data):
+    """
+    3개년 추이 화면(도메인별 그래프 4개)을 생성합니다. 그래프는 데이터셋 버전별로 캐시됩니다.
+    """
+    return [
+        html.Div(className='content-section',
+                 children=[html.H3(title), dcc.Graph(id=graph_id, figure=get_trend_figure(data, name, build), className='trend-graph')])
+        for graph_id, title, name, build, _ in TREND_GRAPHS
+    ]
+
+# KPI 화면 구성: (도메인, 섹션 제목, [(카드 제목, 컬럼, 단위, 색상 키), ...]). 순위 카드는 컬럼이 None 입니다.
+KPI_SECTIONS = [
+    ('reputation', "평판도", [("QS 순위", None, '', 'QS'), ("THE 순위", None, '', 'THE'), ("ARWU 순위", None, '', 'ARWU')]),
+    ('research', "연구실적", [("연구비 수혜실적", 'Funding', '억원', 'Funding'), ("피인용지수", 'Citation', '', 'Citation')]),
+    ('cooperation', "산학협력", [("기술이전 수입료", 'Tech_transfer', '억원', 'Tech_transfer'),
+                             ("특허 출원 및 등록", 'Patent_registration', '', 'Patent_registration'),
+                             ("현장실습 이수율", 'Internship_rate', '%', 'Internship_rate')]),
+]
+# 글로벌 섹션: 총 유학생 수 카드와 국가별 유학생 그래프 (년도별 상위 국가 + 기타, src/country_mix.py)
+GLOBAL_CARD_KEY = 'Total_students'
+COUNTRY_GRAPH_ID = 'country-graph'
+
+def card_id(color_key):
+    # 카드의 고정 id. 카드 안에서 값이 바뀌는 노드의 id 는 여기에 노드 이름을 붙입니다 (common_components.CARD_FIELDS).
+    return f'kpi-{color_key}'
+
+# KPI 화면의 (카드 id, 값 이름 목록). KPI_SECTIONS 순서 다음에 총 유학생 수 카드입니다.
+KPI_CARDS = [
+    (card_id(color_key), KPI_CARD_FIELDS if column else RANKING_CARD_FIELDS)
+    for _, _, cards in KPI_SECTIONS for _, column, _, color_key in cards
+] + [(card_id(GLOBAL_CARD_KEY), KPI_CARD_FIELDS)]
+# 년도 변경 시 값만 바꾸는 출력 (컴포넌트 id, 속성): 카드 값 노드들과 국가별 유학생 그래프
+KPI_OUTPUTS = [output for key, fields in KPI_CARDS for output in card_outputs(key, fields)] + [(COUNTRY_GRAPH_ID, 'figure')]
+
+def _kpi_states(data, selected_year, base_year=None):
+    """
+    선택 년도의 KPI 카드와 국가별 유학생 그래프에 표시할 값을 계산합니다. 컴포넌트는 만들지 않습니다.
+    반환값은 (섹션별 카드 값 목록, 총 유학생 수 카드 값, 그래프 값)이며 KPI_SECTIONS 의 순서와 같습니다.
+    """
+    # 로딩 시 미리 만들어 둔 년도별 레코드와 증감표를 바로 조회합니다.
+    with metrics.phase('lookup'):
+        metric_store = data['metric_store']
+        delta_table = data['delta_table']
+        reputation_current = metric_store.record('reputation', selected_year)
+        countries = data['country_mix'].year(selected_year)
+        comparisons = {domain: delta_table.compare(domain, selected_year, base_year) for domain in ('reputation', 'research', 'cooperation', 'global')}
+        # 여러 대학 비교 정보는 로딩 시 년도별로 계산되어 있습니다. 비교 순위표가 없으면 None 입니다.
+        peer_benchmark = data.get('peer_benchmark')
+        peer_names = peer_benchmark.peers if peer_benchmark else None
+
+    sections = []
+    for domain, _, cards in KPI_SECTIONS:
+        comparison = comparisons[domain]
+        states = []
+        for title, column, suffix, _ in cards:
+            if column is None:
+                ranking = title.split(" ")[0]
+                peer = peer_benchmark.get(ranking, selected_year) if peer_benchmark else None
+                states.append(ranking_card_state(title, reputation_current, comparison, peer, peer_names))
+            else:
+                states.append(kpi_card_state(title, comparison, column, suffix))
+        sections.append(states)
+    total = kpi_card_state("총 유학생 수", comparisons['global'], 'Total_students')
+    graph = {'x': countries['countries'], 'y': countries['students'], 'colors': countries['colors'],
+             'title': f'국가별 유학생 수 ({selected_year})'}
+    return sections, total, graph
+
+def build_kpi_sections(data, selected_year, base_year=None):
+    """
+    선택 년도의 KPI 화면(도메인별 카드와 국가별 유학생 그래프)을 생성합니다.
+    증감은 기준 년도(기본값: 전년도)와 비교하며, 로딩 시 계산된 delta_table 에서 읽습니다.
+    값이 바뀌는 노드에는 고정 id 가 붙어 있으므로, 이후 년도 변경은 kpi_updates() 로 그 노드의 값만 바꿉니다.
+    """
+    item_colors = data['item_colors']
+    sections, total, graph = _kpi_states(data, selected_year, base_year)
+
+    children = [
+        html.Div(className='content-section',
+                 children=[html.H3(section_title),
+                           html.Div(className='kpi-card-container',
+                                    children=[
+                                        (build_kpi_card if column else build_ranking_card)(
+                                            title, state, color=item_colors[color_key], card_id=card_id(color_key))
+                                        for (title, column, _, color_key), state in zip(cards, states)
+                                    ])])
+        for (_, section_title, cards), states in zip(KPI_SECTIONS, sections)
+    ]
+    children.append(
+        html.Div(className='content-section',
+                 children=[
+                     html.H3("글로벌"),
+                     html.Div(
+                         className='global-kpi-row',
+                         children=[
+                             html.Div(
+                                 className='global-kpi-total',
+                                 children=[build_kpi_card("총 유학생 수", total, color=item_colors[GLOBAL_CARD_KEY],
+                                                          card_id=card_id(GLOBAL_CARD_KEY))]
+                             ),
+                             html.Div(
+                                 className='global-kpi-chart',
+                                 children=[
+                                     dcc.Graph(
+                                         id=COUNTRY_GRAPH_ID,
+                                         figure=go.Figure(
+                                             data=[go.Bar(
+                                                 x=graph['x'],
+                                                 y=graph['y'],
+                                                 marker_color=graph['colors']
+                                             )],
+                                             layout=go.Layout(
+                                                 title=graph['title'],
+                                                 margin={'t': 40, 'b': 40, 'l': 40, 'r': 40}
+                                             )
+                                         ),
+                                         className='country-graph'
+                                     )
+                                 ]
+                             )
+                         ]
+                     )
+                 ])
+    )
+    return children
+
+def kpi_updates(data, shown, selected_year, base_year=None):
+    """
+    shown(화면에 표시 중인 (년도, 기준 년도))에서 선택 년도로 바뀔 때 KPI_OUTPUTS 순서대로 출력할 값을 반환합니다.
+    달라진 카드 값만 보내고 나머지는 no_update 이며, 그래프는 막대(국가, 높이, 색상)/제목 중 바뀐 것만 담은 Patch 입니다.
+    화면이 같은 데이터셋의 build_kpi_sections() 결과일 때만 사용할 수 있습니다.
+    """
+    sections, total, graph = _kpi_states(data, selected_year, base_year)
+    old_sections, old_total, old_graph = _kpi_states(data, *shown)
+
+    states = [state for states in sections for state in states] + [total]
+    old_states = [state for states in old_sections for state in states] + [old_total]
+    values = []
+    for (_, fields), state, old_state in zip(KPI_CARDS, states, old_states):
+        values += card_updates(fields, state, old_state)
+
+    if graph == old_graph:
+        return values + [no_update]
+    figure = Patch()
+    # 년도마다 상위 국가가 달라질 수 있으므로 국가 목록과 색상도 바뀐 경우에만 보냅니다.
+    if graph['x'] != old_graph['x']:
+        figure['data'][0]['x'] = graph['x']
+    if graph['y'] != old_graph['y']:
+        figure['data'][0]['y'] = graph['y']
+    if graph['colors'] != old_graph['colors']:
+        figure['data'][0]['marker']['color'] = graph['colors']
+    if graph['title'] != old_graph['title']:
+        figure['layout']['title']['text'] = graph['title']
+    return values + [figure]
+
+def shown_state(data, selected_year, base_year):
+    """
+    KPI 화면에 표시 중인 내용을 나타내는 값(summary-shown 의 data)입니다.
+    """
+    return {'version': data['data_version'], 'year': selected_year, 'base_year': base_year}
+
+def build_summary_layout():
+    """
+    현재 데이터셋의 년도 목록으로 요약 페이지 레이아웃을 생성합니다.
+    엑셀을 다시 읽지 않고 로드된 데이터를 사용하며, 데이터가 교체되면 새 년도가 바로 반영됩니다.
+    """
+    with metrics.phase('lookup'):
+        data = page_registry.page_data('summary')
+        years = data_handler.years(data['df_reputation']) if data else []
+        base_years = data['metric_store'].years() if data else []
+    if not years:
+        years = DEFAULT_YEARS
+
+    # 클라이언트 전환 모드에서는 KPI 화면을 최신 년도 값으로 미리 채워 보내고, 이후 년도 변경은 바뀐 값만 해당 노드로 보냅니다.
+    # 그 밖에는 KPI/추이 화면 모두 콜백이 채웁니다.
+    prefilled = CLIENTSIDE_TOGGLE and bool(data)
+    content = [
         html.Div(
             id="summary-content",
             className='main-container',
-            children=[] # 콜백에 의해 채워질 예정
+            children=build_kpi_sections(data, max(years)) if prefilled else []
         )
     ]
-)
+    if CLIENTSIDE_TOGGLE:
+        content.append(dcc.Store(id="summary-shown", data=shown_state(data, max(years), PREVIOUS_YEAR) if prefilled else None))
+        # 추이 화면은 년도와 무관하므로 페이지 로드 시 한 번만 내려보내고 숨겨 둡니다.
+        content.append(html.Div(
+            id="summary-trend-content",
+            className='main-container',
+            style={'display': 'none'},
+            children=build_trend_sections(data) if data else []
+        ))
+
+    return html.Div(
+        children=[
+            # 하위 메뉴: 토글 버튼 및 년도 선택 드롭다운
+            html.Div(
+                className="toggle-container",
+                children=[
+                    dcc.Dropdown(
+                        id='year-selector',
+                        options=[{'label': str(year), 'value': year} for year in years],
+                        value=max(years),  # 최신 년도를 초기값으로 설정
+                        clearable=False,
+                        className='year-selector'
+                    ),
+                    # 증감 비교 기준 년도 (기본값: 전년 대비)
+                    dcc.Dropdown(
+                        id='base-year-selector',
+                        options=[{'label': '전년 대비', 'value': PREVIOUS_YEAR}] + [{'label': f'{year}년 대비', 'value': year} for year in base_years],
+                        value=PREVIOUS_YEAR,
+                        clearable=False,
+                        className='base-year-selector'
+                    ),
+                    html.Div("3개년 추이보기", className='toggle-label'),
+                    html.Button(id="trend-button", n_clicks=0, className='toggle-button'),
+                    # 보고서 내보내기: 백그라운드 작업으로 엑셀을 만들며, 작업 중에만 진행 막대와 취소 버튼을 표시합니다.
+                    html.Button("보고서 내보내기", id="report-button", className='report-button'),
+                    html.Progress(id="report-progress", className='report-progress', style={'display': 'none'}),
+                    html.Button("취소", id="report-cancel", className='report-button', style={'display': 'none'}),
+                    dcc.Download(id="report-download")
+                ]
+            ),
+            *content
+        ]
+    )
@@ -0,0 +1,132 @@
+import os
+
+import pandas as pd
+
+from src.data_handler import rank_bounds
+
+# 비교용 순위표(data/peers.xlsx)의 long format 컬럼.
+# 한 행이 (년도, 대학, 순위 기관) 하나이며, Ranking 은 'QS', 'THE', 'ARWU' 처럼 카드 제목의 접두어와 같습니다.
+PEER_COLUMNS = ('Year', 'Institution', 'Country', 'Ranking', 'Rank')
+
+# 순위표에서 우리 대학을 가리키는 Institution 값
+HOME_INSTITUTION = os.environ.get('CUK_HOME_INSTITUTION', 'The Catholic University of Korea')
+# 순위 격차를 보여줄 비교 대학 (쉼표로 구분)
+PEER_INSTITUTIONS = [name.strip() for name in os.environ.get('CUK_PEER_INSTITUTIONS', '').split(',') if name.strip()]
+
+
+def compute_positions(df):
+    """
+    long format 순위표에 기관별 상대 위치 컬럼을 추가한 DataFrame을 반환합니다.
+
+    - Rank_Low/Rank_High/Rank_Mid: 범위 순위('801-850')의 숫자형 하한/상한/중간값
+    - Ranked: 같은 년도, 같은 순위 기관에서 순위가 있는 대학 수
+    - Top_Percent: 상위 몇 %인지 (1위 = 100/Ranked, 같은 범위의 대학은 같은 값)
+    - Domestic_Rank / Domestic_Ranked: 같은 국가 대학 사이에서 다시 계산한 순위와 대학 수
+    - Rank_Change / Domestic_Change: 전년 대비 순위 변동 (양수면 상승)
+
+    모든 계산은 (순위 기관, 년도[, 국가]) 그룹 단위의 groupby/rank 연산으로 처리합니다.
+    """
+    table = df.loc[:, list(PEER_COLUMNS)].dropna(subset=['Year', 'Institution', 'Ranking'])
+    low, high = rank_bounds(table['Rank'])
+    table = table.assign(
+        Year=table['Year'].astype('int64'),
+        Ranking=table['Ranking'].astype(str),
+        Rank_Low=low, Rank_High=high, Rank_Mid=(low + high) / 2,
+    )
+    # 순위가 없는(미공개) 행은 상대 위치 계산에서 제외합니다.
+    table = table[table['Rank_Mid'].notna()]
+
+    by_year = table.groupby(['Ranking', 'Year'], observed=True)['Rank_Mid']
+    by_country = table.groupby(['Ranking', 'Year', 'Country'], observed=True)['Rank_Mid']
+    table = table.assign(
+        Ranked=by_year.transform('size'),
+        Top_Percent=by_year.rank(method='max', pct=True) * 100,
+        Domestic_Rank=by_country.rank(method='min'),
+        Domestic_Ranked=by_country.transform('size'),
+    )
+
+    # 전년 행을 년도+1 로 옮겨 붙이면 연속되지 않은 년도도 정확히 비교됩니다.
+    keys = ['Ranking', 'Institution', 'Year']
+    prev = table[keys + ['Rank_Mid', 'Domestic_Rank']].drop_duplicates(keys)
+    prev = prev.assign(Year=prev['Year'] + 1)
+    table = table.merge(prev, on=keys, how='left', suffixes=('', '_Prev'))
+    table['Rank_Change'] = table['Rank_Mid_Prev'] - table['Rank_Mid']
+    table['Domestic_Change'] = table['Domestic_Rank_Prev'] - table['Domestic_Rank']
+    return table.drop(columns=['Rank_Mid_Prev', 'Domestic_Rank_Prev']).sort_values(['Ranking', 'Year', 'Rank_Mid'], ignore_index=True)
+
+
+def peer_gaps(positions, home, peers):
+    """
+    (순위 기관, 년도)별로 우리 대학과 비교 대학의 순위 차이를 계산합니다.
+    값은 우리 순위 - 비교 대학 순위(중간값 기준)이며, 음수면 우리가 앞선 것입니다.
+    """
+    names = [home] + [peer for peer in peers if peer != home]
+    mids = positions[positions['Institution'].isin(names)].pivot_table(
+        index=['Ranking', 'Year'], columns='Institution', values='Rank_Mid', aggfunc='first', observed=True
+    )
+    mids = mids.reindex(columns=names)
+    return mids[names[1:]].rsub(mids[home], axis=0)
+
+
+class PeerBenchmark:
+    """
+    비교 순위표를 년도별로 미리 계산해 두고 콜백에서 바로 조회하는 객체입니다.
+
+        peer = peer_benchmark.get('QS', 2025)
+        peer['top_percent'], peer['domestic_rank'], peer['gaps']['Yonsei University']
+    """
+    __slots__ = ('home', 'peers', 'positions', '_records', '_slices')
+
+    def __init__(self, df, home=HOME_INSTITUTION, peers=PEER_INSTITUTIONS):
+        self.home = home
+        self.peers = [peer for peer in peers if peer != home]
+        self.positions = compute_positions(df)
+        self._slices = self.positions.groupby(['Ranking', 'Year'], observed=True).indices
+        gaps = peer_gaps(self.positions, home, self.peers)
+
+        # (순위 기관, 년도) -> 우리 대학 요약. 우리 대학 행만 순회하므로 비교 대학 수와 무관합니다.
+        self._records = {}
+        home_rows = self.positions[self.positions['Institution'] == home]
+        for row in home_rows.itertuples(index=False):
+            key = (row.Ranking, row.Year)
+            if key in self._records:
+                continue
+            row_gaps = gaps.loc[key] if key in gaps.index else pd.Series(dtype='float64')
+            self._records[key] = {
+                'rank': row.Rank,
+                'ranked': int(row.Ranked),
+                'top_percent': float(row.Top_Percent),
+                'domestic_rank': row.Domestic_Rank,
+                'domestic_ranked': int(row.Domestic_Ranked),
+                'rank_change': row.Rank_Change,
+                'domestic_change': row.Domestic_Change,
+                'gaps': {peer: float(row_gaps.get(peer)) for peer in self.peers if pd.notna(row_gaps.get(peer))},
+            }
+
+    def get(self, ranking, year):
+        """
+        해당 순위 기관, 년도의 우리 대학 요약을 반환합니다. 없으면 None 입니다.
+        """
+        return self._records.get((ranking, int(year)))
+
+    def table(self, ranking, year):
+        """
+        해당 순위 기관, 년도의 전체 대학 상대 위치 표를 순위 순서로 반환합니다.
+        """
+        rows = self._slices.get((ranking, int(year)))
+        if rows is None:
+            return self.positions.iloc[0:0]
+        return self.positions.iloc[rows]
+
+    def years(self, ranking=None):
+        return sorted({int(year) for name, year in self._slices if ranking is None or name == ranking})
+
+
+def build_peer_benchmark(global_data):
+    """
+    global_data 의 비교 순위표(df_peers)로 PeerBenchmark 를 생성합니다. 순위표가 없으면 None 입니다.
+    """
+    df = global_data.get('df_peers')
+    if df is None or df.empty:
+        return None
+    return PeerBenchmark(df)
@@ -0,0 +1,329 @@
+import csv
+import hashlib
+import json
+import os
+import time
+
+import pandas as pd
+
+from src import data_handler
+
+# 원본 레코드(연구비 수혜, 논문/피인용, 기술이전, 특허) 위치. 종류별 하위 디렉터리에 CSV 또는 Parquet 파일을 둡니다.
+# 새 레코드는 CSV 파일 끝에 덧붙이거나 새 파일로 추가하며, 이미 집계한 행은 다시 읽지 않습니다.
+RAW_DIR = os.environ.get('CUK_RAW_DIR', os.path.join('data', 'raw'))
+
+# 한 번에 읽어 집계할 행 수. 파일 전체를 메모리에 올리지 않습니다.
+CHUNK_ROWS = int(os.environ.get('CUK_RAW_CHUNK_ROWS', '200000'))
+
+# CSV 인코딩. 엑셀에서 저장한 BOM 포함 UTF-8 도 읽습니다.
+CSV_ENCODING = 'utf-8-sig'
+
+# 파일이 덧붙여진 것인지 새로 쓰인 것인지 구분할 때 비교하는 앞부분 크기(바이트)
+HEAD_BYTES = 1 << 16
+
+# global_data 키 -> {지표 컬럼: (원본 종류, 년도 컬럼, 값 컬럼, 집계, 배율)}
+# - 년도 컬럼은 년도 숫자(2024)나 날짜('2024-03-01') 모두 가능합니다.
+# - 값 컬럼이 None 이면 레코드 수를 셉니다 (특허 출원/등록 건수).
+# - 집계는 sum | count | mean 이며, 배율은 단위 변환용입니다 (원 -> 억원: 1e-8).
+# 엑셀(data/research.xlsx 등)의 같은 컬럼은 같은 년도의 집계 값으로 대체되고, 나머지 컬럼(현장실습 이수율 등)은 그대로 사용합니다.
+RAW_METRICS = {
+    'df_research': {
+        'Funding': ('grants', 'Date', 'Amount', 'sum', 1e-8),
+        'Citation': ('publications', 'Year', 'Citations', 'sum', 1),
+    },
+    'df_cooperation': {
+        'Tech_transfer': ('tech_transfers', 'Date', 'Amount', 'sum', 1e-8),
+        'Patent_application': ('patents', 'Application_date', None, 'count', 1),
+        'Patent_registration': ('patents', 'Registration_date', None, 'count', 1),
+    },
+}
+
+
+class _Slice:
+    """
+    열린 파일의 현재 위치부터 end 바이트 앞까지만 읽게 하는 file-like 객체입니다.
+    기록 중인 CSV 의 마지막(줄바꿈 전) 행을 읽지 않도록 pd.read_csv 에 넘깁니다.
+    """
+    __slots__ = ('_file', '_end')
+
+    def __init__(self, file, end):
+        self._file = file
+        self._end = end
+
+    def read(self, size=-1):
+        remaining = self._end - self._file.tell()
+        if remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        return self._file.read(size)
+
+
+def _metrics_by_source(key):
+    sources = {}
+    for metric, (source, year_column, value_column, _, _) in RAW_METRICS.get(key, {}).items():
+        sources.setdefault(source, {})[metric] = (year_column, value_column)
+    return sources
+
+
+def _source_files(source):
+    directory = os.path.join(RAW_DIR, source)
+    try:
+        entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+    except OSError:
+        return []
+    return [entry.path for entry in entries if entry.is_file() and entry.name.lower().endswith(('.csv', '.parquet'))]
+
+
+def signature(key):
+    """
+    global_data 키의 원본 레코드 파일 상태((경로, mtime, 크기) 목록)를 반환합니다. 파일이 없으면 빈 tuple 입니다.
+    data_reload 가 엑셀과 함께 변경 감지에 사용합니다.
+    """
+    result = []
+    for source in _metrics_by_source(key):
+        for path in _source_files(source):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            result.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(result)
+
+
+def _years(values):
+    """
+    년도 컬럼을 정수 년도 Series 로 변환합니다. 날짜 문자열/타임스탬프는 년도만 사용하며, 읽을 수 없는 값은 NaN 입니다.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.dt.year
+    years = pd.to_numeric(values, errors='coerce')
+    dates = years.isna() & values.notna()
+    if dates.any():
+        years = years.where(~dates, pd.to_datetime(values.where(dates), errors='coerce').dt.year)
+    return years
+
+
+def _accumulate(partials, chunk, metrics):
+    """
+    chunk 의 레코드를 지표별 년도 합계/건수로 묶어 partials({지표: DataFrame(sum, count)})에 더합니다.
+    """
+    for metric, (year_column, value_column) in metrics.items():
+        years = _years(chunk[year_column])
+        if value_column is None:
+            values = pd.Series(1.0, index=chunk.index)
+        else:
+            values = pd.to_numeric(chunk[value_column], errors='coerce')
+        valid = years.notna() & values.notna()
+        grouped = values[valid].groupby(years[valid].astype('int64')).agg(['sum', 'count'])
+        partials[metric] = grouped if metric not in partials else partials[metric].add(grouped, fill_value=0)
+
+
+def _columns(metrics):
+    return sorted({column for pair in metrics.values() for column in pair if column is not None})
+
+
+def _head_digest(f, length):
+    f.seek(0)
+    return hashlib.sha256(f.read(min(length, HEAD_BYTES))).hexdigest()
+
+
+def _complete_end(f, size):
+    # 마지막 줄바꿈 바로 뒤의 위치. 기록 중인 마지막 행은 다음 집계에서 읽습니다.
+    position = size
+    while position > 0:
+        start = max(0, position - HEAD_BYTES)
+        f.seek(start)
+        block = f.read(position - start)
+        index = block.rfind(b'\n')
+        if index >= 0:
+            return start + index + 1
+        position = start
+    return 0
+
+
+def _ingest_csv(path, entry, metrics):
+    """
+    CSV 파일에서 지난 집계 이후 덧붙여진 행만 읽어 집계를 갱신합니다.
+    파일 앞부분이나 헤더가 바뀌었으면(덮어쓰기) 처음부터 다시 읽습니다. (새 항목, 읽은 행 수)를 반환합니다.
+    """
+    stat = os.stat(path)
+    with open(path, 'rb') as f:
+        header_line = f.readline()
+        header = next(csv.reader([header_line.decode(CSV_ENCODING)]), [])
+        appended = (
+            entry is not None and entry.get('header') == header and stat.st_size >= entry['offset']
+            and _head_digest(f, entry['offset']) == entry['head']
+        )
+        partials = _load_partials(entry) if appended else {}
+        start = entry['offset'] if appended else len(header_line)
+        end = _complete_end(f, stat.st_size)
+
+        rows = 0
+        missing = [column for column in _columns(metrics) if column not in header]
+        if missing:
+            raise ValueError(f"{path} 에 {', '.join(missing)} 컬럼이 없습니다.")
+        if end > start:
+            f.seek(start)
+            reader = pd.read_csv(
+                _Slice(f, end), header=None, names=header, usecols=_columns(metrics),
+                chunksize=CHUNK_ROWS, encoding=CSV_ENCODING,
+            )
+            for chunk in reader:
+                _accumulate(partials, chunk, metrics)
+                rows += len(chunk)
+        offset = max(end, start)
+        head = _head_digest(f, offset)
+    return _entry(stat, partials, offset=offset, header=header, head=head), rows
+
+
+def _ingest_parquet(path, metrics):
+    """
+    Parquet 파일을 행 그룹 단위로 읽어 집계합니다. Parquet 파일은 덧붙일 수 없으므로 바뀌면 다시 읽습니다.
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError(f"pyarrow is required to read {path}. Run 'pip install pyarrow'.")
+    stat = os.stat(path)
+    partials, rows = {}, 0
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=CHUNK_ROWS, columns=_columns(metrics)):
+        chunk = batch.to_pandas()
+        _accumulate(partials, chunk, metrics)
+        rows += len(chunk)
+    return _entry(stat, partials), rows
+
+
+def _entry(stat, partials, **extra):
+    return {
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        # JSON 에는 지표별 [년도, 합계, 건수] 목록으로 저장합니다.
+        'partials': {
+            metric: [[int(year), float(row['sum']), int(row['count'])] for year, row in frame.iterrows()]
+            for metric, frame in partials.items()
+        },
+        **extra,
+    }
+
+
+def _load_partials(entry):
+    return {
+        metric: pd.DataFrame(rows, columns=['year', 'sum', 'count']).set_index('year')
+        for metric, rows in entry['partials'].items()
+    }
+
+
+def _state_name(source):
+    return f'raw-{source}.json'
+
+
+def _read_state(source):
+    for snapshot_dir in data_handler._snapshot_dirs():
+        try:
+            with open(os.path.join(snapshot_dir, _state_name(source)), encoding='utf-8') as f:
+                return snapshot_dir, json.load(f)
+        except (OSError, ValueError):
+            continue
+    return None, {}
+
+
+def _write_state(source, state):
+    payload = json.dumps(state, ensure_ascii=False).encode('utf-8')
+    for snapshot_dir in data_handler._snapshot_dirs():
+        try:
+            data_handler._atomic_write(os.path.join(snapshot_dir, _state_name(source)), lambda f: f.write(payload))
+            return
+        except OSError as e:
+            print(f"Warning: could not write raw aggregates to {snapshot_dir}: {e}")
+
+
+def _ingest_source(source, metrics):
+    """
+    한 종류의 원본 파일들을 집계해 파일별 항목 목록과 새로 읽은 행 수를 반환합니다.
+    집계 상태는 스냅샷 디렉터리에 저장되어, 변경이 없는 파일은 열지 않고 덧붙여진 CSV 는 새 행만 읽습니다.
+    여러 워커가 동시에 집계하지 않도록 상태 파일을 잠근 채로 처리합니다.
+    """
+    lock_dir = data_handler._snapshot_dirs()[0]
+    try:
+        os.makedirs(lock_dir, exist_ok=True)
+    except OSError:
+        lock_dir = data_handler.FALLBACK_SNAPSHOT_DIR
+    with data_handler._manifest_lock(lock_dir, _state_name(source)):
+        _, state = _read_state(source)
+        spec = json.dumps(metrics, sort_keys=True)
+        # 집계 규칙이 바뀌었으면 저장된 집계를 버리고 다시 읽습니다.
+        files = state.get('files', {}) if state.get('spec') == spec else {}
+
+        new_files, rows = {}, 0
+        for path in _source_files(source):
+            name = os.path.normpath(path)
+            entry = files.get(name)
+            stat = os.stat(path)
+            if entry is not None and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+                new_files[name] = entry
+                continue
+            if path.lower().endswith('.csv'):
+                new_files[name], count = _ingest_csv(path, entry, metrics)
+            else:
+                new_files[name], count = _ingest_parquet(path, metrics)
+            rows += count
+
+        # 삭제된 파일의 집계는 상태에서도 제거됩니다.
+        if rows or new_files.keys() != files.keys() or state.get('spec') != spec:
+            _write_state(source, {'spec': spec, 'files': new_files})
+    return list(new_files.values()), rows
+
+
+def aggregate(key):
+    """
+    global_data 키의 원본 레코드를 년도별 지표 DataFrame(Year + 지표 컬럼)으로 집계합니다.
+    원본 레코드 파일이 하나도 없으면 None 입니다.
+    """
+    sources = _metrics_by_source(key)
+    if not any(_source_files(source) for source in sources):
+        return None
+
+    start = time.perf_counter()
+    totals, rows, files = {}, 0, 0
+    for source, metrics in sources.items():
+        entries, count = _ingest_source(source, metrics)
+        rows += count
+        files += len(entries)
+        for entry in entries:
+            for metric, partial in _load_partials(entry).items():
+                totals[metric] = partial if metric not in totals else totals[metric].add(partial, fill_value=0)
+
+    columns = {}
+    for metric, (_, _, _, how, scale) in RAW_METRICS[key].items():
+        total = totals.get(metric)
+        if total is None:
+            continue
+        if how == 'sum':
+            values = total['sum']
+        elif how == 'count':
+            values = total['count']
+        else:
+            values = total['sum'] / total['count']
+        columns[metric] = values * scale
+    frame = pd.DataFrame(columns).sort_index()
+    frame.index = frame.index.astype('int64')
+    frame = frame.rename_axis('Year').reset_index()
+    print(f"Aggregated {key} from {files} raw file(s): {rows} new record(s) in {time.perf_counter() - start:.2f}s")
+    return frame
+
+
+def merge(df, raw):
+    """
+    엑셀 DataFrame(df)과 원본 레코드 집계(raw)를 년도 기준으로 합칩니다. 같은 년도·같은 컬럼은 집계 값을 사용합니다.
+    둘 중 하나가 None 이면 다른 하나를 그대로 반환합니다.
+    """
+    if raw is None:
+        return df
+    if df is None:
+        return raw
+    base = df.assign(Year=pd.to_numeric(df['Year'], errors='coerce'))
+    base = base[base['Year'].notna()].drop_duplicates('Year').set_index('Year')
+    merged = raw.set_index('Year').combine_first(base)
+    columns = list(df.columns) + [column for column in raw.columns if column not in df.columns]
+    return merged.reset_index().loc[:, columns]
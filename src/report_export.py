@@ -0,0 +1,48 @@
+import io
+
+import pandas as pd
+
+from src.metric_store import DOMAIN_FRAMES
+
+# 보고서 시트 이름 (도메인 -> 시트)
+SHEET_NAMES = {
+    'reputation': '평판도 증감',
+    'research': '연구실적 증감',
+    'cooperation': '산학협력 증감',
+    'global': '글로벌 증감',
+}
+PEER_SHEET = '비교 순위'
+COUNTRY_SHEET = '국가별 유학생'
+
+
+def report_sheets(data):
+    """
+    보고서에 들어갈 (시트 이름, DataFrame 을 만드는 함수) 목록을 반환합니다.
+    증감표는 로딩 시 계산된 delta_table 의 long format 표이며, 국가별 유학생 수(long format)와 비교 순위표가 있으면 뒤에 넣습니다.
+    """
+    delta_table = data['delta_table']
+    sheets = [
+        (SHEET_NAMES[name], lambda name=name: delta_table.table(name).growth)
+        for name, key in DOMAIN_FRAMES.items() if key in data
+    ]
+    country_mix = data.get('country_mix')
+    if country_mix is not None:
+        sheets.append((COUNTRY_SHEET, lambda: country_mix.table.sort_values(['Year', 'Students'], ascending=[True, False])))
+    peer_benchmark = data.get('peer_benchmark')
+    if peer_benchmark is not None:
+        sheets.append((PEER_SHEET, lambda: peer_benchmark.positions))
+    return sheets
+
+
+def build_report(data, progress=None):
+    """
+    기획 보고용 엑셀 파일 내용(bytes)을 만듭니다. progress(완료 시트 수, 전체 시트 수)로 진행 상황을 알립니다.
+    """
+    sheets = report_sheets(data)
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+        for i, (sheet_name, frame) in enumerate(sheets):
+            frame().to_excel(writer, sheet_name=sheet_name, index=False)
+            if progress is not None:
+                progress(i + 1, len(sheets))
+    return buffer.getvalue()
@@ -0,0 +1,137 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import flask
+
+from src import data_reload
+
+# 콜백 응답 캐시의 최대 크기(MB). 0 이면 캐시하지 않습니다. 워커 프로세스별로 따로 유지됩니다.
+MAX_BYTES = int(float(os.environ.get('CUK_RESPONSE_CACHE_MB', '32')) * 1024 * 1024)
+
+# 응답을 캐시할 콜백의 출력 컴포넌트 id. 입력과 데이터셋 버전만으로 결과가 정해지는 콜백만 등록합니다.
+_cached_ids = set()
+
+# (데이터셋 버전, 요청 본문 해시) -> 응답 본문. 가장 오래 사용하지 않은 항목부터 제거합니다.
+_entries = OrderedDict()
+_size = 0
+_lock = threading.Lock()
+_stats = {'hit': 0, 'miss': 0}
+
+
+def cache_outputs(*component_ids):
+    """
+    해당 컴포넌트를 출력으로 갖는 콜백의 응답을 캐시하도록 등록합니다.
+    콜백 결과가 입력값과 데이터셋 버전에만 의존할 때만 사용해야 합니다.
+    """
+    _cached_ids.update(component_ids)
+
+
+def _output_ids(output):
+    # 다중 출력은 '..a.children...b.className..' 형식입니다.
+    parts = output[2:-2].split('...') if output.startswith('..') and output.endswith('..') else [output]
+    return [part.rsplit('.', 1)[0] for part in parts]
+
+
+def _version():
+    data = data_reload.current()
+    return data['data_version'] if data else None
+
+
+def _request_key(path):
+    request = flask.request
+    # 백그라운드 콜백의 결과 확인 요청(?cacheKey=...&job=...)은 같은 본문으로 반복되므로 캐시하지 않습니다.
+    if request.method != 'POST' or request.path != path or request.args:
+        return None
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict) or not any(component_id in _cached_ids for component_id in _output_ids(body.get('output', ''))):
+        return None
+    # 같은 입력이면 Dash 가 같은 본문을 보내므로 원본 바이트의 해시를 키로 사용합니다.
+    return _version(), hashlib.sha256(request.get_data()).hexdigest()
+
+
+def _count(name):
+    # 스레드 워커에서도 횟수가 빠지지 않도록 잠금 안에서 셉니다.
+    with _lock:
+        _stats[name] += 1
+
+
+def _put(key, body):
+    global _size
+    with _lock:
+        if key in _entries:
+            return
+        _entries[key] = body
+        _size += len(body)
+        while _size > MAX_BYTES and _entries:
+            _, old_body = _entries.popitem(last=False)
+            _size -= len(old_body)
+
+
+def invalidate(version=None):
+    """
+    캐시를 비웁니다. version 을 주면 해당 버전이 아닌 응답만 제거합니다.
+    """
+    global _size
+    with _lock:
+        for key in [key for key in _entries if version is None or key[0] != version]:
+            _size -= len(_entries.pop(key))
+
+
+def stats():
+    """
+    캐시 적중/미적중 횟수와 현재 항목 수, 크기(바이트)를 반환합니다.
+    """
+    with _lock:
+        return dict(_stats, entries=len(_entries), bytes=_size)
+
+
+def install(app):
+    """
+    app.server 에 콜백 응답 캐시를 설치합니다.
+
+    cache_outputs() 로 등록된 콜백의 요청은 (데이터셋 버전, 요청 본문)이 같으면 콜백을 실행하지 않고
+    저장된 응답을 돌려줍니다. dash-renderer 는 콜백 요청에 If-None-Match 를 보내지 않으므로 ETag/304 는 사용하지 않습니다.
+    데이터가 교체되면 이전 버전의 응답은 모두 제거됩니다.
+    Flask-Compress 보다 나중에 등록되므로 압축 전 본문을 저장하고, 압축은 응답마다 적용됩니다.
+    """
+    if MAX_BYTES <= 0:
+        return
+    path = app.config.routes_pathname_prefix + '_dash-update-component'
+    server = app.server
+
+    @server.before_request
+    def serve_cached_response():
+        key = _request_key(path)
+        if key is None:
+            return None
+        flask.g.response_cache_key = key
+        with _lock:
+            body = _entries.get(key)
+            if body is not None:
+                _entries.move_to_end(key)
+        if body is None:
+            _count('miss')
+            return None
+
+        flask.g.response_cache_hit = True
+        _count('hit')
+        response = flask.Response(body, mimetype='application/json')
+        response.headers['X-Cache'] = 'HIT'
+        return response
+
+    @server.after_request
+    def store_response(response):
+        key = flask.g.pop('response_cache_key', None)
+        if key is None or flask.g.pop('response_cache_hit', False):
+            return response
+        # 요청 처리 중 데이터가 교체되었으면 어느 버전의 결과인지 확실하지 않으므로 저장하지 않습니다.
+        if response.status_code != 200 or response.mimetype != 'application/json' or key[0] != _version():
+            return response
+
+        _put(key, response.get_data())
+        response.headers['X-Cache'] = 'MISS'
+        return response
+
+    data_reload.subscribe(lambda data: invalidate(data['data_version']))
@@ -0,0 +1,58 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# gunicorn.conf.py 가 preload 모드에서 켭니다. 켜져 있으면 마스터 프로세스가 한 번 읽은 데이터를
+# 메모리 매핑 배열로 바꾸어 두고, fork 된 워커들이 같은 물리 메모리를 복사 없이 읽습니다.
+ENABLED = os.environ.get('CUK_SHARED_DATA', '0') == '1'
+
+# 매핑 파일을 만들 위치. 메모리 기반 파일시스템(/dev/shm)이 있으면 그곳을 사용합니다.
+SHARED_ROOT = os.environ.get('CUK_SHARED_DIR', '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir())
+
+# 메모리 매핑이 가능한 numpy dtype 종류 (bool, 정수, 실수, 복소수, 시간)
+MAPPABLE_KINDS = 'biufcmM'
+
+
+def share_frame(df, directory, name):
+    """
+    DataFrame의 숫자형 컬럼을 .npy 파일로 기록한 뒤 읽기 전용 메모리 매핑으로 다시 열어,
+    같은 내용의 DataFrame을 반환합니다.
+
+    문자열/혼합형(object) 컬럼은 매핑할 수 없으므로 기존 객체를 그대로 사용하며,
+    preload 모드에서는 fork 시 copy-on-write 로 공유됩니다.
+    """
+    columns = {}
+    for i in range(df.shape[1]):
+        series = df.iloc[:, i]
+        if isinstance(series.dtype, np.dtype) and series.dtype.kind in MAPPABLE_KINDS:
+            path = os.path.join(directory, f'{name}-{i}.npy')
+            np.save(path, series.to_numpy())
+            columns[i] = np.load(path, mmap_mode='r')
+        else:
+            columns[i] = series
+    # copy=False 로 생성해야 컬럼별 블록이 매핑된 배열을 그대로 가리킵니다.
+    shared = pd.DataFrame(columns, index=df.index, copy=False)
+    shared.columns = df.columns
+    return shared
+
+
+def share_frames(data):
+    """
+    data 의 모든 DataFrame을 메모리 매핑 기반으로 바꾼 새 dict 를 반환합니다.
+
+    매핑된 파일은 삭제해도 매핑이 유지되므로 작업 디렉터리는 바로 정리합니다.
+    따라서 마스터가 종료되면 공유 메모리도 함께 해제되고, 남는 파일이 없습니다.
+    데이터가 다시 로드되면 바뀐 DataFrame만 각 워커의 개별 메모리로 읽힙니다.
+    """
+    directory = tempfile.mkdtemp(prefix='cuk_dash_shared-', dir=SHARED_ROOT)
+    try:
+        shared = dict(data)
+        for key, value in data.items():
+            if isinstance(value, pd.DataFrame):
+                shared[key] = share_frame(value, directory, key)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return shared
@@ -0,0 +1,66 @@
+"""
+읽기 전용 데이터 스냅샷
+
+콜백이 사용하는 데이터(DataFrame, 메트릭 스토어, 증감표, 색상 등)는 한 시점의 DataSnapshot 으로 묶여
+data_reload 가 보관하며, page_registry.page_data() / data_reload.current() 가 그 참조를 돌려줍니다.
+
+gunicorn 스레드 워커(--threads, CUK_THREADS)에서 여러 요청이 같은 프로세스의 데이터를 동시에 읽어도 안전하도록
+다음을 보장합니다.
+
+    1. 스냅샷은 바뀌지 않습니다. 항목 추가/교체/삭제는 TypeError 이고, dict 항목(item_colors 등)도 읽기 전용입니다.
+       데이터가 바뀌면 data_reload 가 새 스냅샷을 만든 뒤 참조만 교체하므로, 읽는 쪽은 잠금이 필요 없습니다.
+    2. 콜백은 요청 처음에 스냅샷을 한 번 받아 끝까지 그것만 사용합니다. 처리 중에 데이터가 교체되어도
+       한 응답 안의 값은 모두 같은 버전(snapshot.version)에서 나옵니다.
+    3. 스냅샷 안의 DataFrame과 파생 객체(MetricStore, DeltaTables, PeerBenchmark, CountryMix)는 만든 뒤 수정하지 않습니다.
+       값을 바꿔 써야 하면 복사본(df.assign 등)을 만듭니다. 파생 객체의 지연 계산(CountryMix.trend 등)은
+       같은 입력으로 같은 결과를 만들기 때문에 두 스레드가 동시에 계산해도 결과가 같습니다.
+    4. 프로세스 전역 캐시(figure_cache, response_cache, metrics)는 각자 잠금으로 보호됩니다.
+       캐시된 figure dict 는 여러 요청이 공유하므로 수정하지 않고, 일부만 바꿀 때는 Patch 를 반환합니다.
+    5. 요청별 상태는 스레드 지역 변수(metrics.phase)나 Dash 의 callback_context 에만 둡니다.
+
+새 데이터는 일반 dict 로 만든 뒤(data_reload.attach_derived) DataSnapshot 으로 감싸 등록합니다.
+
+    data = dict(data_reload.current())   # 수정 가능한 복사본
+    data.update(new_frames)
+    data_reload.publish(data_reload.attach_derived(data))
+"""
+from collections.abc import Mapping
+from types import MappingProxyType
+
+
+class DataSnapshot(Mapping):
+    """
+    한 데이터셋 버전의 읽기 전용 dict 입니다. snapshot['df_global'], snapshot.get('peer_benchmark') 처럼 읽습니다.
+    version 은 데이터셋 버전(data_version)이며, dict(snapshot) 으로 수정 가능한 복사본을 만들 수 있습니다.
+    """
+    __slots__ = ('_items', 'version')
+
+    def __init__(self, items):
+        items = {
+            key: MappingProxyType(dict(value)) if isinstance(value, dict) else value
+            for key, value in items.items()
+        }
+        object.__setattr__(self, '_items', items)
+        object.__setattr__(self, 'version', items.get('data_version'))
+
+    def __getitem__(self, key):
+        return self._items[key]
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __repr__(self):
+        return f"<{type(self).__name__} version={self.version} keys={sorted(self._items)}>"
+
+
+def freeze(data):
+    """
+    data 를 DataSnapshot 으로 반환합니다. 이미 스냅샷이면 그대로 반환합니다.
+    """
+    return data if isinstance(data, DataSnapshot) else DataSnapshot(data)